@@ -15,16 +15,29 @@ OPTIONS:
     python run_pipeline.py --dry-run          # Preview without API calls
     python run_pipeline.py --skip-synthesis   # Run clustering only (no Phase D)
     python run_pipeline.py --resume           # Resume from last successful phase
+    python run_pipeline.py --isolated         # Run each phase in its own process
 """
 
 import os
+import re
 import sys
 import json
 import argparse
+import functools
+import importlib.util
+import itertools
 import subprocess
 import time
+import traceback
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 
 # =============================================================================
@@ -33,6 +46,22 @@ from datetime import datetime
 
 SCRIPTS_DIR = Path(__file__).parent / "scripts"
 
+# Distinct module names for phases loaded in-process
+_PHASE_MODULE_IDS = itertools.count()
+
+# Append-only checkpoint log, one JSON record per phase transition
+PROGRESS_FILE = ".pipeline_progress.jsonl"
+LEGACY_PROGRESS_FILE = ".pipeline_progress.json"
+
+# KEY=VALUE lines in .env; comment lines and lines without '=' never match
+ENV_LINE_RE = re.compile(r'^[ \t]*([^#\s=][^=\n]*?)[ \t]*=([^\n]*)$', re.MULTILINE)
+
+# Expected shape of an Anthropic API key; other keys are used with a warning
+API_KEY_RE = re.compile(r'^sk-ant-[A-Za-z0-9_\-]{20,}$')
+
+# The "sk-ant-your-..." placeholder that setup_project.py writes into .env
+API_KEY_PLACEHOLDER_PREFIX = "sk-ant-your"
+
 PHASES = [
     {
         "id": "B",
@@ -40,7 +69,9 @@ PHASES = [
         "script": "layer1_extractor.py",
         "args": lambda cfg: [cfg["srptd_raw_dir"], "-o", cfg["extractions_dir"]],
         "requires_api": False,
-        "check_output": lambda cfg: len(list(Path(cfg["extractions_dir"]).glob("*.json"))) > 0,
+        "check_output": lambda cfg: has_json_files(cfg["extractions_dir"]),
+        # Its worker pool must import the script by name; see run_phase
+        "process_pool": True,
     },
     {
         "id": "C.0-C.1",
@@ -128,35 +159,49 @@ def print_phase(phase_id: str, phase_name: str, status: str = "RUNNING"):
     print(f"\n[Phase {phase_id}] {phase_name} ... {color}{status}{reset}")
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_env_file(env_path: str, mtime_ns: int) -> dict:
+    """Parse a .env file in one pass (cached per path and modification time)."""
+    text = Path(env_path).read_text(encoding='utf-8')
+    return {
+        key: value.strip().strip('"').strip("'")
+        for key, value in ENV_LINE_RE.findall(text)
+    }
+
+
 def load_env_file(env_path: Path) -> dict:
     """Load environment variables from .env file."""
-    env_vars = {}
-    if env_path.exists():
-        with open(env_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip().strip('"').strip("'")
-    return env_vars
+    try:
+        mtime_ns = env_path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return dict(_parse_env_file(str(env_path), mtime_ns))
+
+
+def _usable_api_key(api_key: str, source: str) -> str:
+    """Return api_key unless it is empty or the setup placeholder."""
+    if not api_key:
+        return ""
+    if api_key.startswith(API_KEY_PLACEHOLDER_PREFIX):
+        print(f"  WARNING: ANTHROPIC_API_KEY in {source} is still the setup placeholder; ignoring it.")
+        return ""
+    if not API_KEY_RE.match(api_key):
+        # The phase scripts send any non-empty key, so keep it
+        print(f"  WARNING: ANTHROPIC_API_KEY in {source} is present but malformed "
+              f"(expected sk-ant-...); using it anyway.")
+    return api_key
 
 
 def check_api_key(project_root: Path) -> str:
-    """Check for API key in environment or .env file."""
+    """Check for a usable API key in environment or .env file."""
     # Check environment first
-    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    api_key = _usable_api_key(os.environ.get("ANTHROPIC_API_KEY", ""), "the environment")
     if api_key:
         return api_key
 
     # Check .env file
-    env_file = project_root / ".env"
-    if env_file.exists():
-        env_vars = load_env_file(env_file)
-        api_key = env_vars.get("ANTHROPIC_API_KEY")
-        if api_key:
-            return api_key
-
-    return ""
+    env_vars = load_env_file(project_root / ".env")
+    return _usable_api_key(env_vars.get("ANTHROPIC_API_KEY", ""), ".env")
 
 
 def ensure_directories(cfg: dict):
@@ -172,61 +217,130 @@ def ensure_directories(cfg: dict):
 
 
 def count_input_files(srptd_dir: str) -> int:
-    """Count markdown files in input directory."""
-    srptd_path = Path(srptd_dir)
-    if not srptd_path.exists():
-        return 0
-    return len(list(srptd_path.glob("*.md"))) + len(list(srptd_path.glob("**/*.md")))
+    """Count markdown files in input directory (recursively)."""
+    total = 0
+    stack = [srptd_dir]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    total += 1
+    return total
 
 
-def save_progress(project_root: Path, phase_id: str, status: str):
-    """Save progress to a checkpoint file."""
-    checkpoint_file = project_root / ".pipeline_progress.json"
-    progress = {}
-    if checkpoint_file.exists():
-        with open(checkpoint_file, 'r') as f:
-            progress = json.load(f)
+def has_json_files(directory: str) -> bool:
+    """Check for at least one .json file, stopping at the first match."""
+    try:
+        with os.scandir(directory) as it:
+            return any(entry.name.endswith(".json") for entry in it)
+    except OSError:
+        return False
+
+
+def read_json(path: Path):
+    """Load a JSON file (uses orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
-    progress[phase_id] = {
+def dump_json_line(record: dict) -> bytes:
+    """Serialize a record as one compact JSON line (uses orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(record) + b"\n"
+    # Match orjson's output: raw UTF-8 and no spaces after separators
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def save_progress(project_root: Path, phase_id: str, status: str, ts: Optional[float] = None):
+    """
+    Append a phase transition to the checkpoint log.
+
+    ts is a time.time() value the caller already has; it defaults to now.
+    """
+    record = {
+        "phase": phase_id,
         "status": status,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.fromtimestamp(time.time() if ts is None else ts).isoformat(),
     }
-    progress["last_phase"] = phase_id
-    progress["last_status"] = status
-
-    with open(checkpoint_file, 'w') as f:
-        json.dump(progress, f, indent=2)
+    with open(project_root / PROGRESS_FILE, "ab") as f:
+        f.write(dump_json_line(record))
+
+
+def migrate_legacy_progress(project_root: Path):
+    """Convert an old .pipeline_progress.json checkpoint into the append-only log."""
+    legacy_file = project_root / LEGACY_PROGRESS_FILE
+    checkpoint_file = project_root / PROGRESS_FILE
+    if checkpoint_file.exists() or not legacy_file.exists():
+        return
+
+    legacy = read_json(legacy_file)
+    entries = [
+        (entry.get("timestamp", ""), phase_id, entry["status"])
+        for phase_id, entry in legacy.items()
+        if isinstance(entry, dict) and "status" in entry
+    ]
+    with open(checkpoint_file, "wb") as f:
+        for timestamp, phase_id, status in sorted(entries):
+            f.write(dump_json_line({"phase": phase_id, "status": status, "timestamp": timestamp}))
+    legacy_file.unlink()
 
 
 def load_progress(project_root: Path) -> dict:
-    """Load progress from checkpoint file."""
-    checkpoint_file = project_root / ".pipeline_progress.json"
-    if checkpoint_file.exists():
-        with open(checkpoint_file, 'r') as f:
-            return json.load(f)
-    return {}
+    """Fold the checkpoint log into per-phase progress (last record wins)."""
+    migrate_legacy_progress(project_root)
 
+    progress = {}
+    try:
+        data = (project_root / PROGRESS_FILE).read_bytes()
+    except FileNotFoundError:
+        return progress
 
-def run_phase(phase: dict, cfg: dict, project_root: Path) -> bool:
-    """Run a single pipeline phase."""
-    script_path = SCRIPTS_DIR / phase["script"]
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    for line in data.split(b"\n"):
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError:
+            # Torn last line from an interrupted write
+            continue
+        progress[record["phase"]] = {
+            "status": record["status"],
+            "timestamp": record["timestamp"],
+        }
+        progress["last_phase"] = record["phase"]
+        progress["last_status"] = record["status"]
 
-    if not script_path.exists():
-        print(f"  ERROR: Script not found: {script_path}")
+    return progress
+
+
+def phase_completed(phase: dict, progress: dict, cfg: dict) -> bool:
+    """Check whether a phase succeeded previously and its output still exists."""
+    if progress.get(phase["id"], {}).get("status") != "SUCCESS":
         return False
+    return phase["check_output"](cfg)
 
-    # Build command
-    cmd = [sys.executable, str(script_path)] + phase["args"](cfg)
 
-    # Set up environment
-    env = os.environ.copy()
+def phase_skip_reason(phase: dict, skip_synthesis: bool, api_key: str, dry_run: bool) -> Optional[str]:
+    """Why a phase will be skipped whatever its checkpoint says, or None."""
+    if skip_synthesis and phase.get("is_synthesis"):
+        return "--skip-synthesis"
+    if phase["requires_api"] and not api_key and not dry_run:
+        return "requires API key"
+    return None
 
-    # Load .env file
-    env_vars = load_env_file(project_root / ".env")
-    env.update(env_vars)
 
-    # Set working directory context
-    env["SRPTD_PROJECT_ROOT"] = str(project_root)
+def _run_phase_subprocess(script_path: Path, args: list, env: dict, project_root: Path) -> bool:
+    """Run a phase script in a fresh Python interpreter."""
+    cmd = [sys.executable, str(script_path)] + args
 
     try:
         # Run the script
@@ -242,6 +356,105 @@ def run_phase(phase: dict, cfg: dict, project_root: Path) -> bool:
         return False
 
 
+def _run_phase_in_process(script_path: Path, args: list, env_vars: dict, project_root: Path) -> bool:
+    """
+    Load a phase script under a fresh module name and call its main().
+
+    argv, working directory and environment are swapped in for the call and
+    restored afterwards, so the script sees the same context it would get as
+    a subprocess. The scripts directory is on sys.path only for the call, and
+    the phase module and any sibling modules it imports (e.g. config) are
+    dropped afterwards, with previously loaded modules of the same names put
+    back, so no state carries over between phases or runs. An int returned
+    from main() is treated as the exit code.
+    """
+    scripts_dir = script_path.parent.resolve()
+    module_name = f"_pipeline_phase_{script_path.stem}_{next(_PHASE_MODULE_IDS)}"
+
+    # Sibling modules the script imports by bare name must resolve to scripts/
+    sibling_names = {p.stem for p in scripts_dir.glob("*.py")}
+    shadowed = {name: sys.modules.pop(name) for name in sibling_names if name in sys.modules}
+
+    saved_path = sys.path[:]
+    saved_argv = sys.argv
+    saved_cwd = os.getcwd()
+    saved_env = {key: os.environ.get(key) for key in env_vars}
+
+    sys.path.insert(0, str(scripts_dir))
+    sys.argv = [str(script_path)] + args
+    os.environ.update(env_vars)
+    os.chdir(project_root)
+
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        rc = module.main()
+        return not isinstance(rc, int) or rc == 0
+    except SystemExit as e:
+        return e.code in (None, 0)
+    except Exception as e:
+        # Same stack trace a subprocess run would have shown
+        traceback.print_exc()
+        print(f"  ERROR: {e}")
+        return False
+    finally:
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        sys.modules.pop(module_name, None)
+        for name in sibling_names:
+            sys.modules.pop(name, None)
+        sys.modules.update(shadowed)
+
+
+def build_phase_env(project_root: Path, isolated: bool = False) -> dict:
+    """
+    Build the environment for phase scripts once per pipeline run.
+
+    In-process phases only need the .env values and SRPTD_PROJECT_ROOT laid
+    over the current environment; isolated phases get the full merged
+    environment to pass straight to the subprocess.
+    """
+    # Load .env file
+    env_vars = load_env_file(project_root / ".env")
+
+    # Set working directory context
+    env_vars["SRPTD_PROJECT_ROOT"] = str(project_root)
+
+    if isolated:
+        return {**os.environ, **env_vars}
+    return env_vars
+
+
+def run_phase(phase: dict, cfg: dict, project_root: Path, phase_env: dict, isolated: bool = False) -> bool:
+    """Run a single pipeline phase, in-process unless isolated is set."""
+    script_path = SCRIPTS_DIR / phase["script"]
+
+    if not script_path.exists():
+        print(f"  ERROR: Script not found: {script_path}")
+        return False
+
+    if isolated:
+        return _run_phase_subprocess(script_path, phase["args"](cfg), phase_env, project_root)
+
+    if phase.get("process_pool"):
+        # Pool workers started by spawn/forkserver re-import the worker
+        # function by module name, which an in-process phase does not have
+        import multiprocessing
+        if multiprocessing.get_start_method() != "fork":
+            return _run_phase_subprocess(
+                script_path, phase["args"](cfg), {**os.environ, **phase_env}, project_root)
+
+    return _run_phase_in_process(script_path, phase["args"](cfg), phase_env, project_root)
+
+
 # =============================================================================
 # Main Pipeline
 # =============================================================================
@@ -252,6 +465,7 @@ def run_pipeline(
     dry_run: bool = False,
     skip_synthesis: bool = False,
     resume: bool = False,
+    isolated: bool = False,
 ):
     """Run the complete pipeline."""
 
@@ -303,56 +517,54 @@ def run_pipeline(
 
     # Load progress if resuming
     progress = {}
-    start_from_phase = 0
     if resume:
         progress = load_progress(project_root)
-        if progress.get("last_status") == "SUCCESS":
-            # Find next phase
-            for i, phase in enumerate(PHASES):
-                if progress.get(phase["id"], {}).get("status") != "SUCCESS":
-                    start_from_phase = i
-                    break
-            if start_from_phase > 0:
-                print(f"\n  Resuming from Phase {PHASES[start_from_phase]['id']}")
+        # Same rules as the loop below: the first phase that will run
+        for phase in PHASES:
+            if phase_skip_reason(phase, skip_synthesis, api_key, dry_run):
+                continue
+            if not phase_completed(phase, progress, cfg):
+                if phase is not PHASES[0]:
+                    print(f"\n  Resuming from Phase {phase['id']}")
+                break
+        else:
+            print(f"\n  Nothing to resume: remaining phases are completed or skipped")
+
+    phase_env = build_phase_env(project_root, isolated)
 
     # Run phases
     print_header("Running Pipeline Phases")
 
     start_time = time.time()
     results = {"success": [], "failed": [], "skipped": []}
-
-    for i, phase in enumerate(PHASES):
-        # Skip synthesis if requested
-        if skip_synthesis and phase.get("is_synthesis"):
+    honor_checkpoints = resume
+
+    for phase in PHASES:
+        # Skip synthesis if requested, or AI phases without an API key.
+        # When resuming, also skip already completed phases; once any phase
+        # actually runs, downstream checkpoints are stale and ignored.
+        reason = phase_skip_reason(phase, skip_synthesis, api_key, dry_run)
+        if reason is None and honor_checkpoints and phase_completed(phase, progress, cfg):
+            reason = "already completed"
+        if reason:
             print_phase(phase["id"], phase["name"], "SKIPPED")
-            results["skipped"].append(phase["id"])
-            continue
-
-        # Skip already completed phases when resuming
-        if resume and i < start_from_phase:
-            print_phase(phase["id"], phase["name"], "SKIPPED")
-            print("  (already completed)")
-            results["skipped"].append(phase["id"])
-            continue
-
-        # Check if phase requires API and we don't have it
-        if phase["requires_api"] and not api_key and not dry_run:
-            print_phase(phase["id"], phase["name"], "SKIPPED")
-            print("  (requires API key)")
+            print(f"  ({reason})")
             results["skipped"].append(phase["id"])
             continue
 
         print_phase(phase["id"], phase["name"], "RUNNING")
 
-        success = run_phase(phase, cfg, project_root)
+        honor_checkpoints = False
+        success = run_phase(phase, cfg, project_root, phase_env, isolated=isolated)
+        finished_at = time.time()
 
         if success:
             print_phase(phase["id"], phase["name"], "SUCCESS")
-            save_progress(project_root, phase["id"], "SUCCESS")
+            save_progress(project_root, phase["id"], "SUCCESS", ts=finished_at)
             results["success"].append(phase["id"])
         else:
             print_phase(phase["id"], phase["name"], "FAILED")
-            save_progress(project_root, phase["id"], "FAILED")
+            save_progress(project_root, phase["id"], "FAILED", ts=finished_at)
             results["failed"].append(phase["id"])
             print(f"\n  Pipeline stopped at Phase {phase['id']}")
             print(f"  Fix the issue and run again with --resume")
@@ -389,6 +601,7 @@ Examples:
   python run_pipeline.py --dry-run          Preview without API calls
   python run_pipeline.py --skip-synthesis   Run clustering only
   python run_pipeline.py --resume           Resume from last checkpoint
+  python run_pipeline.py --isolated         Run each phase in its own process
   python run_pipeline.py --project /path    Use specific project directory
         """
     )
@@ -419,6 +632,11 @@ Examples:
         action="store_true",
         help="Resume from last successful phase"
     )
+    parser.add_argument(
+        "--isolated",
+        action="store_true",
+        help="Run each phase in a separate Python process"
+    )
 
     args = parser.parse_args()
 
@@ -430,6 +648,7 @@ Examples:
         dry_run=args.dry_run,
         skip_synthesis=args.skip_synthesis,
         resume=args.resume,
+        isolated=args.isolated,
     )
 
     sys.exit(0 if success else 1)
@@ -13,10 +13,18 @@ Environment Variables (optional):
 """
 
 import os
+import re
 import json
+import functools
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 def get_project_root() -> Path:
     """
@@ -32,6 +40,17 @@ def get_project_root() -> Path:
     return Path.cwd()
 
 
+_ENV_API_KEY_RE = re.compile(r'^[ \t]*ANTHROPIC_API_KEY=(.*)$', re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_env_api_key(path_str: str, mtime_ns: int) -> Optional[str]:
+    """Find ANTHROPIC_API_KEY in a .env file; cached per (path, mtime)."""
+    with open(path_str, 'r', encoding='utf-8') as f:
+        match = _ENV_API_KEY_RE.search(f.read())
+    return match.group(1).strip() if match else None
+
+
 def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     """
     Load configuration from config.json file.
@@ -45,12 +64,14 @@ def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     if config_path is None:
         config_path = get_project_root() / "config.json"
 
-    if config_path.exists():
+    try:
+        if HAS_ORJSON:
+            return orjson.loads(Path(config_path).read_bytes())
         with open(config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
-
-    # Return defaults if no config file
-    return get_default_config()
+    except FileNotFoundError:
+        # Return defaults if no config file
+        return get_default_config()
 
 
 def get_default_config() -> Dict[str, Any]:
@@ -122,116 +143,74 @@ class PipelineConfig:
         config = PipelineConfig(config_path="my_config.json")
     """
 
-    def __init__(self, config_path: Optional[Path] = None):
-        self._config = load_config(config_path)
-        self._project_root = Path(self._config.get("project_root", get_project_root()))
-
-    @property
-    def project_root(self) -> Path:
-        return self._project_root
-
-    @property
-    def srptd_raw_dir(self) -> Path:
-        return Path(self._config.get("srptd_raw_dir", self._project_root / "srptd_raw"))
-
-    @property
-    def extractions_dir(self) -> Path:
-        return Path(self._config.get("extractions_dir", self._project_root / "extractions"))
-
-    @property
-    def clusters_dir(self) -> Path:
-        return Path(self._config.get("clusters_dir", self._project_root / "clusters"))
-
-    @property
-    def skills_output_dir(self) -> Path:
-        return Path(self._config.get("skills_output_dir", self._project_root / "skills_out"))
-
-    @property
-    def doc_cards_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("doc_cards_subdir", "doc_cards")
-
-    @property
-    def buckets_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("buckets_subdir", "buckets")
-
-    @property
-    def enriched_cards_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("enriched_cards_subdir", "doc_cards_enriched")
-
-    @property
-    def enriched_buckets_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("enriched_buckets_subdir", "buckets_enriched")
-
-    @property
-    def incremental_clusters_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("incremental_clusters_subdir", "clusters_incremental")
+    __slots__ = (
+        '_config',
+        'project_root',
+        'srptd_raw_dir',
+        'extractions_dir',
+        'clusters_dir',
+        'skills_output_dir',
+        'doc_cards_dir',
+        'buckets_dir',
+        'enriched_cards_dir',
+        'enriched_buckets_dir',
+        'incremental_clusters_dir',
+        'final_clusters_dir',
+        'representatives_dir',
+        'manifests_dir',
+        'model_for_enrichment',
+        'model_for_clustering',
+        'model_for_synthesis',
+        'min_bucket_size',
+        'max_clusters_per_prompt',
+        'similarity_threshold',
+        'min_cluster_size_for_audit',
+        'domain_vocabulary',
+        'pattern_vocabulary',
+        'domain_rollups',
+        'domain_affinity',
+        'pattern_affinity',
+    )
 
-    @property
-    def final_clusters_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("final_clusters_subdir", "clusters_final")
-
-    @property
-    def representatives_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("representatives_subdir", "representatives")
-
-    @property
-    def manifests_dir(self) -> Path:
-        return self.clusters_dir / self._config.get("manifests_subdir", "manifests")
-
-    # Model Configuration
-    @property
-    def model_for_enrichment(self) -> str:
-        return self._config.get("model_for_enrichment", "claude-sonnet-4-20250514")
-
-    @property
-    def model_for_clustering(self) -> str:
-        return self._config.get("model_for_clustering", "claude-sonnet-4-20250514")
-
-    @property
-    def model_for_synthesis(self) -> str:
-        return self._config.get("model_for_synthesis", "claude-opus-4-5-20251101")
-
-    # Processing Parameters
-    @property
-    def min_bucket_size(self) -> int:
-        return self._config.get("min_bucket_size_for_clustering", 1)
-
-    @property
-    def max_clusters_per_prompt(self) -> int:
-        return self._config.get("max_clusters_per_prompt", 10)
-
-    @property
-    def similarity_threshold(self) -> float:
-        return self._config.get("similarity_threshold", 0.25)
-
-    @property
-    def min_cluster_size_for_audit(self) -> int:
-        return self._config.get("min_cluster_size_for_audit", 10)
-
-    # Vocabularies
-    @property
-    def domain_vocabulary(self) -> list:
-        return self._config.get("domain_vocabulary", [])
-
-    @property
-    def pattern_vocabulary(self) -> list:
-        return self._config.get("pattern_vocabulary", [])
-
-    @property
-    def domain_rollups(self) -> dict:
-        return self._config.get("domain_rollups", {})
-
-    @property
-    def domain_affinity(self) -> dict:
-        return self._config.get("domain_affinity", {})
+    def __init__(self, config_path: Optional[Path] = None):
+        self._config = config = load_config(config_path)
+        self.project_root = root = Path(config.get("project_root", get_project_root()))
+
+        # Directory Structure (resolved once, not per access)
+        self.srptd_raw_dir = Path(config.get("srptd_raw_dir", root / "srptd_raw"))
+        self.extractions_dir = Path(config.get("extractions_dir", root / "extractions"))
+        self.clusters_dir = clusters = Path(config.get("clusters_dir", root / "clusters"))
+        self.skills_output_dir = Path(config.get("skills_output_dir", root / "skills_out"))
+        self.doc_cards_dir = clusters / config.get("doc_cards_subdir", "doc_cards")
+        self.buckets_dir = clusters / config.get("buckets_subdir", "buckets")
+        self.enriched_cards_dir = clusters / config.get("enriched_cards_subdir", "doc_cards_enriched")
+        self.enriched_buckets_dir = clusters / config.get("enriched_buckets_subdir", "buckets_enriched")
+        self.incremental_clusters_dir = clusters / config.get("incremental_clusters_subdir", "clusters_incremental")
+        self.final_clusters_dir = clusters / config.get("final_clusters_subdir", "clusters_final")
+        self.representatives_dir = clusters / config.get("representatives_subdir", "representatives")
+        self.manifests_dir = clusters / config.get("manifests_subdir", "manifests")
+
+        # Model Configuration
+        self.model_for_enrichment = config.get("model_for_enrichment", "claude-sonnet-4-20250514")
+        self.model_for_clustering = config.get("model_for_clustering", "claude-sonnet-4-20250514")
+        self.model_for_synthesis = config.get("model_for_synthesis", "claude-opus-4-5-20251101")
 
-    @property
-    def pattern_affinity(self) -> dict:
-        return self._config.get("pattern_affinity", {})
+        # Processing Parameters
+        self.min_bucket_size = config.get("min_bucket_size_for_clustering", 1)
+        self.max_clusters_per_prompt = config.get("max_clusters_per_prompt", 10)
+        self.similarity_threshold = config.get("similarity_threshold", 0.25)
+        self.min_cluster_size_for_audit = config.get("min_cluster_size_for_audit", 10)
+
+        # Vocabularies
+        self.domain_vocabulary = config.get("domain_vocabulary", [])
+        self.pattern_vocabulary = config.get("pattern_vocabulary", [])
+        self.domain_rollups = config.get("domain_rollups", {})
+        self.domain_affinity = config.get("domain_affinity", {})
+        self.pattern_affinity = config.get("pattern_affinity", {})
 
     def ensure_directories(self):
         """Create all required directories if they don't exist."""
-        dirs = [
+        for d in (
             self.srptd_raw_dir,
             self.extractions_dir,
             self.clusters_dir,
@@ -244,8 +223,7 @@ class PipelineConfig:
             self.final_clusters_dir,
             self.representatives_dir,
             self.manifests_dir,
-        ]
-        for d in dirs:
+        ):
             d.mkdir(parents=True, exist_ok=True)
 
     def get_api_key(self) -> Optional[str]:
@@ -264,16 +242,17 @@ class PipelineConfig:
 
         # Check .env file
         env_file = self.project_root / ".env"
-        if env_file.exists():
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith("ANTHROPIC_API_KEY="):
-                        return line.split("=", 1)[1].strip()
+        try:
+            mtime_ns = os.stat(env_file).st_mtime_ns
+        except OSError:
+            pass
+        else:
+            api_key = _read_env_api_key(str(env_file), mtime_ns)
+            if api_key is not None:
+                return api_key
 
         # Check home directory
-        home_key = Path.home() / ".anthropic" / "api_key"
-        if home_key.exists():
-            return home_key.read_text().strip()
-
-        return None
+        try:
+            return (Path.home() / ".anthropic" / "api_key").read_text().strip()
+        except FileNotFoundError:
+            return None
@@ -18,29 +18,34 @@ Usage:
 
     # With pretty console output
     python layer1_extractor.py path/to/file.md --pretty
+
+    # Limit directory processing to 4 worker processes
+    python layer1_extractor.py path/to/srptd_raw/ -o extractions/ --workers 4
 """
 
+import os
 import re
 import json
 import hashlib
+from bisect import bisect_right
+from itertools import chain, repeat
+from operator import itemgetter
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, Any
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, is_dataclass
 
-# Import config if available, otherwise use defaults
 try:
-    from config import PipelineConfig
-    HAS_CONFIG = True
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    HAS_CONFIG = False
+    HAS_ORJSON = False
 
 
 # =============================================================================
 # Data Classes for Extraction Schema
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Metadata:
     date: Optional[str] = None
     task_id: Optional[str] = None
@@ -51,7 +56,7 @@ class Metadata:
     repo_branch: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Trigger:
     what_triggered: Optional[str] = None
     keywords_phrases: list[str] = field(default_factory=list)
@@ -59,7 +64,7 @@ class Trigger:
     draft_skill_trigger: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextInputs:
     problem_statement: Optional[str] = None
     starting_state: Optional[str] = None
@@ -70,7 +75,7 @@ class ContextInputs:
     success_criteria: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Workflow:
     workflow_type: Optional[str] = None
     high_level_steps: list[str] = field(default_factory=list)
@@ -78,7 +83,7 @@ class Workflow:
     decision_points: list[dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class CodeBlock:
     language: Optional[str] = None
     code: str = ""
@@ -87,7 +92,7 @@ class CodeBlock:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Artifact:
     name: Optional[str] = None
     artifact_type: Optional[str] = None
@@ -96,7 +101,7 @@ class Artifact:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IssueItem:
     issue: Optional[str] = None
     cause: Optional[str] = None
@@ -105,7 +110,13 @@ class IssueItem:
     references: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
+class KnowledgeSource:
+    type: str = ""
+    detail: str = ""
+
+
+@dataclass(slots=True)
 class Tags:
     languages: list[str] = field(default_factory=list)
     frameworks: list[str] = field(default_factory=list)
@@ -116,7 +127,7 @@ class Tags:
     safety_risk: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SkillAssessment:
     reusability_score: Optional[int] = None
     frequency_score: Optional[int] = None
@@ -128,7 +139,7 @@ class SkillAssessment:
     notes: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class SRPTDExtraction:
     """Complete extraction schema for an SR-PTD document."""
     doc_id: str
@@ -150,45 +161,77 @@ class SRPTDExtraction:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        result = asdict(self)
-        # Convert nested dataclass instances
-        result['metadata'] = asdict(self.metadata)
-        result['trigger'] = asdict(self.trigger)
-        result['context_inputs'] = asdict(self.context_inputs)
-        result['workflow'] = asdict(self.workflow)
-        result['skill_assessment'] = asdict(self.skill_assessment)
-        result['tags'] = asdict(self.tags)
-        return result
+        # asdict() already recurses into the nested dataclasses
+        return asdict(self)
 
 
 # =============================================================================
 # Normalization Utilities
 # =============================================================================
 
+# ASCII characters that are neither word characters nor '-'; deleted from tags
+TAG_DELETE_TABLE = {c: None for c in range(128) if not (chr(c).isalnum() or chr(c) in '_-')}
+TAG_NON_WORD_RE = re.compile(r'[^\w\-]')
+
+
 def normalize_tag(tag: str) -> str:
     """Normalize a tag to lowercase with dashes."""
-    tag = tag.strip().lower()
-    tag = re.sub(r'\s+', '-', tag)
-    tag = re.sub(r'[^\w\-]', '', tag)
-    return tag
-
-
-def deduplicate_list(items: list) -> list:
-    """Remove duplicates while preserving order."""
-    seen = set()
-    result = []
-    for item in items:
-        normalized = item.lower().strip() if isinstance(item, str) else item
-        if normalized not in seen:
-            seen.add(normalized)
-            result.append(item)
-    return result
+    # split() collapses whitespace runs exactly like re.sub(r'\s+', ...)
+    tag = '-'.join(tag.lower().split())
+    if tag.isascii():
+        return tag.translate(TAG_DELETE_TABLE)
+    # Unicode word characters need the regex's notion of \w
+    return TAG_NON_WORD_RE.sub('', tag)
+
+
+def normalize_tag_list(raw_tags) -> list[str]:
+    """Normalize tags and drop duplicates in one pass (first occurrence wins)."""
+    # Normalized tags are already lowercase and stripped, so each is its own key
+    unique = {}
+    for t in raw_tags:
+        if t.strip():
+            unique.setdefault(normalize_tag(t))
+    return list(unique)
+
+
+def iter_table_rows(content: str, min_cells: int):
+    """Yield the stripped cells of each markdown table row with enough columns."""
+    for line in content.splitlines():
+        line = line.strip()
+        if not line.startswith('|'):
+            continue
+        cells = [c.strip() for c in line.strip('|').split('|')]
+        if len(cells) >= min_cells:
+            yield cells
+
+
+def first_blockquote(text: str, end: int) -> Optional[str]:
+    """Return the first '>' quote in text[:end], continued over '>' lines.
+
+    A linear-scan equivalent of TRIGGER_QUOTE_RE.search(text, 0, end): the
+    quote starts after the first '>' and its leading whitespace, and runs
+    to the first newline not followed by another '>'.
+    """
+    end = min(end, len(text))
+    pos = text.find('>', 0, end)
+    if pos == -1 or pos + 1 == end:
+        return None
+    start = pos + 1
+    while start < end and text[start].isspace():
+        start += 1
+    if start == end:
+        # Only whitespace follows; the regex captures its last character
+        return text[end - 1:end]
+    stop = text.find('\n', start + 1, end)
+    while stop != -1 and stop + 1 < end and text[stop + 1] == '>':
+        stop = text.find('\n', stop + 1, end)
+    return text[start:end if stop == -1 else stop]
 
 
 def generate_doc_id(source_path: str, content: str) -> str:
     """Generate a unique document ID from path and content hash."""
     filename = Path(source_path).stem
-    content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
+    content_hash = hashlib.md5(content.encode('utf-8'), usedforsecurity=False).hexdigest()[:8]
     return f"{filename}_{content_hash}"
 
 
@@ -196,6 +239,10 @@ def generate_doc_id(source_path: str, content: str) -> str:
 # Section Detection and Parsing
 # =============================================================================
 
+# Any markdown heading line; only these are tested against section patterns
+HEADING_LINE_RE = re.compile(r'^#[^\n]*', re.MULTILINE)
+
+
 class SectionParser:
     """Parser for detecting and extracting sections from SR-PTD documents."""
 
@@ -226,10 +273,22 @@ class SectionParser:
         'tags': r'^##\s*Tags',
     }
 
+    # Each table fused into one alternation of named groups, compiled once.
+    # Alternatives are tried in table order, so the first matching section
+    # wins exactly as with one match per pattern; lastgroup names it.
+    _FULL_SECTION_RE = re.compile(
+        '|'.join(f'(?P<{name}>{pattern})' for name, pattern in FULL_SECTION_PATTERNS.items()),
+        re.IGNORECASE,
+    )
+    _QUICK_SECTION_RE = re.compile(
+        '|'.join(f'(?P<{name}>{pattern})' for name, pattern in QUICK_SECTION_PATTERNS.items()),
+        re.IGNORECASE,
+    )
+
     def __init__(self, content: str):
         self.content = content
-        self.lines = content.split('\n')
         self.sections = {}
+        self.section_spans = {}
         self.format = self._detect_format()
 
     def _detect_format(self) -> str:
@@ -254,38 +313,155 @@ class SectionParser:
         return 'quick'
 
     def extract_sections(self) -> dict[str, str]:
-        """Extract all sections with their raw text content."""
-        sections = {}
-        current_section = 'header'
-        current_content = []
-
-        for line in self.lines:
-            # Check if line is a section header
-            section_match = self._match_section_header(line)
-            if section_match:
-                # Save previous section
-                if current_content:
-                    sections[current_section] = '\n'.join(current_content).strip()
-                current_section = section_match
-                current_content = [line]
-            else:
-                current_content.append(line)
+        """Extract all sections with their raw text content.
+
+        Only lines starting with '#' can be section headers, so those are
+        located with one regex pass and each section is sliced out of the
+        content between consecutive headers; no per-line list is built.
+        (start, end) offsets of each section are kept in section_spans.
+        """
+        content = self.content
+        starts = []
+        for candidate in HEADING_LINE_RE.finditer(content):
+            section_name = self._match_section_header(candidate.group())
+            if section_name:
+                starts.append((candidate.start(), section_name))
+
+        # Text before the first header belongs to the implicit 'header' section
+        bounds = [(0, 'header')] if not starts or starts[0][0] > 0 else []
+        bounds.extend(starts)
+        bounds.append((len(content), None))
 
-        # Save last section
-        if current_content:
-            sections[current_section] = '\n'.join(current_content).strip()
+        sections = {}
+        spans = {}
+        for (start, section_name), (end, _) in zip(bounds, bounds[1:]):
+            sections[section_name] = content[start:end].strip()
+            spans[section_name] = (start, end)
 
+        self.section_spans = spans
         return sections
 
     def _match_section_header(self, line: str) -> Optional[str]:
         """Match a line against section header patterns."""
-        patterns = (self.FULL_SECTION_PATTERNS if self.format == 'full'
-                   else self.QUICK_SECTION_PATTERNS)
+        # Every section pattern starts with '#'
+        if not line.startswith('#'):
+            return None
 
-        for section_name, pattern in patterns.items():
-            if re.match(pattern, line, re.IGNORECASE):
-                return section_name
-        return None
+        regex = (self._FULL_SECTION_RE if self.format == 'full'
+                 else self._QUICK_SECTION_RE)
+
+        match = regex.match(line)
+        return match.lastgroup if match else None
+
+
+# =============================================================================
+# Compiled Content Patterns
+# =============================================================================
+
+# Header metadata: one pass finds every bold key, then the value pattern
+# for that key is matched in place. The first occurrence whose value
+# matches wins, exactly as a separate re.search per field would.
+META_KEY_RE = re.compile(r'\*\*(Date|Type|Domain(?:/Module)?|Complexity|Time Spent|Repo/Branch(?:/PR/Commits)?)\*\*:')
+META_FIELDS = {
+    'Date': ('date', re.compile(r'\s*(\d{4}-\d{2}-\d{2})')),
+    'Type': ('task_type', re.compile(r'\s*([^|*\n]+)')),
+    'Domain': ('domain', re.compile(r'\s*([^|*\n]+)')),
+    'Complexity': ('complexity', re.compile(r'\s*(\w+)')),
+    'Time Spent': ('time_spent', re.compile(r'\s*([^\n]+)')),
+    'Repo': ('repo_branch', re.compile(r'\s*([^\n]+)')),
+}
+
+# Trigger profile
+TRIGGER_QUOTE_RE = re.compile(r'>\s*(.+?)(?=\n(?!>)|$)', re.DOTALL)
+TRIGGER_WHAT_RE = re.compile(
+    r'\*\*What triggered[^*]*\*\*[:\s]*\n?>?\s*(.+?)(?=\n\n|\n\*\*|$)', re.IGNORECASE | re.DOTALL)
+TRIGGER_KEYWORDS_RE = re.compile(
+    r'\*\*Keywords?[^*]*\*\*[:\s]*\n?((?:>?\s*-[^\n]+\n?)+|[^\n*]+)', re.IGNORECASE)
+TRIGGER_MARKERS_RE = re.compile(
+    r'\*\*Context Markers?\*\*[:\s]*\n?((?:>?\s*-[^\n]+\n?)+|[^\n*]+)', re.IGNORECASE)
+TRIGGER_DRAFT_RE = re.compile(
+    r'\*\*Draft Skill Trigger\*\*[:\s]*\n?>?\s*(.+?)(?=\n\n|\n\*\*|$)', re.IGNORECASE | re.DOTALL)
+TRIGGER_ITEM_RE = re.compile(r'[-*>]\s*"?([^"\n]+)"?')
+TRIGGER_MARKER_ITEM_RE = re.compile(r'[-*>]\s*([^\n]+)')
+
+# Context & inputs
+CTX_OBJECTIVE_RE = re.compile(r'\*\*Objective\*\*:\s*([^\n]+)')
+CTX_PROBLEM_RE = re.compile(
+    r'(?:Problem Statement|Requirements/Problem)[:\s]*\n?\*?\*?([^\n*]+(?:\n(?!\*\*)[^\n*]+)*)', re.IGNORECASE)
+CTX_STATE_RE = re.compile(r'\*\*Starting state\*\*:\s*\n?((?:\s*-[^\n]+\n?)+|[^\n*]+)', re.IGNORECASE)
+CTX_ENVIRONMENT_RE = re.compile(
+    r'\*\*Environment(?:/Versions?)?\*\*:\s*\n?((?:\s*-[^\n]+\n?)+|[^\n*]+)', re.IGNORECASE)
+CTX_CONSTRAINTS_RE = re.compile(
+    r'\*\*Constraints?(?:/Dependencies)?\*\*:\s*\n?((?:\s*-[^\n]+\n?)+|[^\n*]+)', re.IGNORECASE)
+CTX_REQUIREMENTS_RE = re.compile(r'\*\*Requirements?(?:/Problem)?\*\*:\s*([^\n]+)')
+
+# Workflow
+WF_TYPE_RE = re.compile(r'\*\*Workflow Type\*\*:\s*(\w+)', re.IGNORECASE)
+WF_STEP_RE = re.compile(r'^\s*(\d+)\.\s+([^\n]+)', re.MULTILINE)
+WF_STEP_LINE_RE = re.compile(r'^(\d+)\.\s*(.+)$', re.MULTILINE)
+WF_KEY_DECISION_RE = re.compile(r'-\s*\*?\*?([^*\n]+)\*?\*?\s*->\s*([^->]+)\s*(?:->\s*(.+))?')
+
+# Code blocks
+CODE_FENCE_RE = re.compile(r'```(\w*)\n(.*?)```', re.DOTALL)
+CODE_HEADING_RE = re.compile(r'^###[^\n]*', re.MULTILINE)
+CODE_CONTEXT_CHARS = 500
+CODE_REUSE_RE = re.compile(
+    r'\[x\]\s*(?:Definitely|Likely)\s*reusable|'
+    r'reusable|'
+    r'should.*become.*skill.*\[x\]',
+    re.IGNORECASE
+)
+
+# Outputs & artifacts
+MODIFIED_FILE_RE = re.compile(
+    r'-\s*`?([^`\n:]+(?:\.(?:py|js|ts|html|css|json|md|yaml|yml|xml))?)`?(?:\s*[-:]?\s*(.+))?')
+
+# Issues & fixes
+ISSUES_SECTION_RE = re.compile(r'##\s*Issues?[^#]*?(?=##|$)', re.IGNORECASE | re.DOTALL)
+ISSUE_BULLET_RE = re.compile(r'-\s*([^->:\n]+)\s*(?:->|:)\s*([^->\n]+)(?:\s*->\s*(.+))?')
+# Words that indicate non-issue entries
+ISSUE_SKIP_WORDS_RE = re.compile(
+    r'tests|validation|success criteria|pr/diff|scripts|snippets|configs|docs updated|template|'
+    r'utility|storage|saved as|location|artifacts|modified files|environment|starting state',
+    re.IGNORECASE
+)
+
+# Verification
+VERIFY_EXPECTED_MARKER_RE = re.compile(r'\*\*(?:After fix|Expected)\*\*:', re.IGNORECASE)
+
+# Skill assessment
+SCORE_RES = {
+    'frequency': re.compile(r'Frequency[^|]*\|\s*(\d)', re.IGNORECASE),
+    'consistency': re.compile(r'Consistency[^|]*\|\s*(\d)', re.IGNORECASE),
+    'complexity': re.compile(r'Complexity[^|]*\|\s*(\d)', re.IGNORECASE),
+    'codifiability': re.compile(r'Codifiability[^|]*\|\s*(\d)', re.IGNORECASE),
+    'toolability': re.compile(r'Tool-?ability[^|]*\|\s*(\d)', re.IGNORECASE),
+}
+TOTAL_SCORE_RE = re.compile(r'(?:TOTAL|Total)[^|]*\|\s*(\d+)')
+PRIORITY_RE = re.compile(r'\[x\]\s*\*?\*?(\w+)\s*Priority', re.IGNORECASE)
+SKILL_POTENTIAL_RE = re.compile(r'Skill Potential:\s*(\w+)', re.IGNORECASE)
+NOTES_RE = re.compile(r'\*\*Notes?\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)', re.IGNORECASE)
+# Skill table: a '|' header row naming Dimension and Score, plus the rows under it
+SKILL_TABLE_RE = re.compile(
+    r'^[ \t]*\|[^\n]*(?:Dimension[^\n]*Score|Score[^\n]*Dimension)[^\n]*(?:\n[ \t]*\|[^\n]*)*',
+    re.MULTILINE
+)
+
+# Tags
+TAG_KEY_RE = re.compile(
+    r'(?:\*\*)?(?:(?P<languages>Languages?)|(?P<frameworks>Frameworks?(?:/Libs?)?)|(?P<domains>Domains?)|'
+    r'(?P<services>(?:External\s*)?Services?)|(?P<patterns>Patterns?)|(?P<tools>Tools?|Operational))(?:\*\*)?:',
+    re.IGNORECASE
+)
+TAG_VALUE_RE = re.compile(r'\s*([^|\n]+)')
+TAG_SPLIT_RE = re.compile(r'[,;]')
+
+# Knowledge accessed
+KNOWLEDGE_DB_RE = re.compile(r'\*\*(?:DB|Database)[^*]*\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)', re.IGNORECASE)
+KNOWLEDGE_API_RE = re.compile(r'\*\*API[^*]*\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)', re.IGNORECASE)
+KNOWLEDGE_CODE_RE = re.compile(
+    r'\*\*(?:Code(?:base)?|Code patterns?)[^*]*\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)', re.IGNORECASE)
+KNOWLEDGE_BULLET_RE = re.compile(r'-\s*\*\*([^*]+)\*\*:\s*([^\n]+)')
 
 
 # =============================================================================
@@ -300,47 +476,20 @@ class ContentExtractor:
         """Extract metadata from document header."""
         metadata = Metadata()
 
-        # Pattern for inline header: **Date**: YYYY-MM-DD | **Type**: ... | **Domain**: ...
-        inline_pattern = r'\*\*Date\*\*:\s*(\d{4}-\d{2}-\d{2})'
-        match = re.search(inline_pattern, content)
-        if match:
-            metadata.date = match.group(1)
-
-        # Type extraction
-        type_pattern = r'\*\*Type\*\*:\s*([^|*\n]+)'
-        match = re.search(type_pattern, content)
-        if match:
-            metadata.task_type = match.group(1).strip()
-
-        # Domain extraction
-        domain_pattern = r'\*\*Domain(?:/Module)?\*\*:\s*([^|*\n]+)'
-        match = re.search(domain_pattern, content)
-        if match:
-            metadata.domain = match.group(1).strip()
-
-        # Complexity extraction
-        complexity_pattern = r'\*\*Complexity\*\*:\s*(\w+)'
-        match = re.search(complexity_pattern, content)
-        if match:
-            metadata.complexity = match.group(1).strip()
-
-        # Time spent extraction
-        time_pattern = r'\*\*Time Spent\*\*:\s*([^\n]+)'
-        match = re.search(time_pattern, content)
-        if match:
-            metadata.time_spent = match.group(1).strip()
-
-        # Legacy bullet point format: - **Date**: YYYY-MM-DD
-        bullet_date_pattern = r'-\s*\*\*Date\*\*:\s*(\d{4}-\d{2}-\d{2})'
-        match = re.search(bullet_date_pattern, content)
-        if match and not metadata.date:
-            metadata.date = match.group(1)
-
-        # Repo/Branch extraction
-        repo_pattern = r'\*\*Repo/Branch(?:/PR/Commits)?\*\*:\s*([^\n]+)'
-        match = re.search(repo_pattern, content)
-        if match:
-            metadata.repo_branch = match.group(1).strip()
+        # Inline header: **Date**: YYYY-MM-DD | **Type**: ... | **Domain**: ...
+        # A "- **Date**:" bullet (legacy format) is matched by the same key.
+        found = set()
+        for key_match in META_KEY_RE.finditer(content):
+            key = key_match.group(1).split('/', 1)[0]
+            if key in found:
+                continue
+            attr, value_re = META_FIELDS[key]
+            match = value_re.match(content, key_match.end())
+            if match:
+                setattr(metadata, attr, match.group(1).strip())
+                found.add(key)
+                if len(found) == len(META_FIELDS):
+                    break
 
         return metadata
 
@@ -350,37 +499,36 @@ class ContentExtractor:
         trigger = Trigger()
 
         # Blockquote trigger (> text)
-        quote_pattern = r'>\s*(.+?)(?=\n(?!>)|$)'
-        quotes = re.findall(quote_pattern, content, re.DOTALL)
+        quotes = TRIGGER_QUOTE_RE.findall(content)
         if quotes:
             trigger.what_triggered = ' '.join(q.strip() for q in quotes)
 
+        # The remaining fields all start with a bold key
+        if '**' not in content:
+            return trigger
+
         # What triggered this task?
-        triggered_pattern = r'\*\*What triggered[^*]*\*\*[:\s]*\n?>?\s*(.+?)(?=\n\n|\n\*\*|$)'
-        match = re.search(triggered_pattern, content, re.IGNORECASE | re.DOTALL)
+        match = TRIGGER_WHAT_RE.search(content)
         if match:
             trigger.what_triggered = match.group(1).strip().lstrip('> ')
 
         # Keywords/Phrases extraction
-        keywords_pattern = r'\*\*Keywords?[^*]*\*\*[:\s]*\n?((?:>?\s*-[^\n]+\n?)+|[^\n*]+)'
-        match = re.search(keywords_pattern, content, re.IGNORECASE)
+        match = TRIGGER_KEYWORDS_RE.search(content)
         if match:
             keywords_text = match.group(1)
             # Extract from bullet list or quoted items
-            items = re.findall(r'[-*>]\s*"?([^"\n]+)"?', keywords_text)
+            items = TRIGGER_ITEM_RE.findall(keywords_text)
             trigger.keywords_phrases = [k.strip(' "\'') for k in items if k.strip()]
 
         # Context markers extraction
-        markers_pattern = r'\*\*Context Markers?\*\*[:\s]*\n?((?:>?\s*-[^\n]+\n?)+|[^\n*]+)'
-        match = re.search(markers_pattern, content, re.IGNORECASE)
+        match = TRIGGER_MARKERS_RE.search(content)
         if match:
             markers_text = match.group(1)
-            items = re.findall(r'[-*>]\s*([^\n]+)', markers_text)
+            items = TRIGGER_MARKER_ITEM_RE.findall(markers_text)
             trigger.context_markers = [m.strip() for m in items if m.strip()]
 
         # Draft skill trigger
-        draft_pattern = r'\*\*Draft Skill Trigger\*\*[:\s]*\n?>?\s*(.+?)(?=\n\n|\n\*\*|$)'
-        match = re.search(draft_pattern, content, re.IGNORECASE | re.DOTALL)
+        match = TRIGGER_DRAFT_RE.search(content)
         if match:
             trigger.draft_skill_trigger = match.group(1).strip().lstrip('> ')
 
@@ -391,41 +539,41 @@ class ContentExtractor:
         """Extract context and inputs information."""
         ctx = ContextInputs()
 
-        # Objective extraction
-        obj_pattern = r'\*\*Objective\*\*:\s*([^\n]+)'
-        match = re.search(obj_pattern, content)
-        if match:
-            ctx.objective = match.group(1).strip()
+        # Objective extraction (case-sensitive key, so a literal check suffices)
+        if '**Objective**' in content:
+            match = CTX_OBJECTIVE_RE.search(content)
+            if match:
+                ctx.objective = match.group(1).strip()
 
         # Problem statement (can span multiple lines)
-        problem_pattern = r'(?:Problem Statement|Requirements/Problem)[:\s]*\n?\*?\*?([^\n*]+(?:\n(?!\*\*)[^\n*]+)*)'
-        match = re.search(problem_pattern, content, re.IGNORECASE)
+        match = CTX_PROBLEM_RE.search(content)
         if match:
             ctx.problem_statement = match.group(1).strip()
 
+        # The remaining fields all start with a bold key
+        if '**' not in content:
+            return ctx
+
         # Starting state
-        state_pattern = r'\*\*Starting state\*\*:\s*\n?((?:\s*-[^\n]+\n?)+|[^\n*]+)'
-        match = re.search(state_pattern, content, re.IGNORECASE)
+        match = CTX_STATE_RE.search(content)
         if match:
             ctx.starting_state = match.group(1).strip()
 
         # Environment
-        env_pattern = r'\*\*Environment(?:/Versions?)?\*\*:\s*\n?((?:\s*-[^\n]+\n?)+|[^\n*]+)'
-        match = re.search(env_pattern, content, re.IGNORECASE)
+        match = CTX_ENVIRONMENT_RE.search(content)
         if match:
             ctx.environment = match.group(1).strip()
 
         # Constraints
-        const_pattern = r'\*\*Constraints?(?:/Dependencies)?\*\*:\s*\n?((?:\s*-[^\n]+\n?)+|[^\n*]+)'
-        match = re.search(const_pattern, content, re.IGNORECASE)
+        match = CTX_CONSTRAINTS_RE.search(content)
         if match:
             ctx.constraints = match.group(1).strip()
 
         # Requirements (from Requirements/Problem field)
-        req_pattern = r'\*\*Requirements?(?:/Problem)?\*\*:\s*([^\n]+)'
-        match = re.search(req_pattern, content)
-        if match:
-            ctx.requirements = match.group(1).strip()
+        if '**Requirement' in content:
+            match = CTX_REQUIREMENTS_RE.search(content)
+            if match:
+                ctx.requirements = match.group(1).strip()
 
         return ctx
 
@@ -435,62 +583,58 @@ class ContentExtractor:
         wf = Workflow()
 
         # Workflow type
-        type_pattern = r'\*\*Workflow Type\*\*:\s*(\w+)'
-        match = re.search(type_pattern, content, re.IGNORECASE)
-        if match:
-            wf.workflow_type = match.group(1)
+        if '**' in content:
+            match = WF_TYPE_RE.search(content)
+            if match:
+                wf.workflow_type = match.group(1)
 
         # Extract numbered steps with multiple patterns
         steps = []
 
         # Pattern 1: Standard numbered list (1. text)
-        pattern1 = re.findall(r'^\s*(\d+)\.\s+(.+?)(?=\n\s*\d+\.|$)', content, re.MULTILINE | re.DOTALL)
+        pattern1 = WF_STEP_RE.findall(content)
         for num, text in pattern1:
-            # Clean up multi-line steps (keep first line or up to sub-bullet)
-            clean_text = text.split('\n')[0].strip()
+            # Steps are single lines; skip sub-bullets
+            clean_text = text.strip()
             if clean_text and not clean_text.startswith('-'):
                 steps.append((int(num), clean_text))
 
         # Pattern 2: Simpler numbered pattern for single lines
         if not steps:
-            pattern2 = re.findall(r'^(\d+)\.\s*(.+)$', content, re.MULTILINE)
+            pattern2 = WF_STEP_LINE_RE.findall(content)
             for num, text in pattern2:
-                steps.append((int(num), text.strip()))
-
-        # Sort by step number and deduplicate
-        steps = sorted(set(steps), key=lambda x: x[0])
-
-        for step_num, step_text in steps:
-            if step_text:
-                wf.high_level_steps.append(step_text)
-                # Create detailed log entry
-                wf.detailed_step_log.append({
-                    "step_number": step_num,
-                    "action": step_text,
-                    "tool_command": None,
-                    "input": None,
-                    "output": None
-                })
+                text = text.strip()
+                if text:
+                    steps.append((int(num), text))
+
+        # Deduplicate (keeping first occurrence) and sort by step number
+        steps = sorted(dict.fromkeys(steps), key=itemgetter(0))
+
+        wf.high_level_steps.extend(step_text for _, step_text in steps)
+        # Create detailed log entries
+        wf.detailed_step_log.extend({
+            "step_number": step_num,
+            "action": step_text,
+            "tool_command": None,
+            "input": None,
+            "output": None
+        } for step_num, step_text in steps)
 
         # Extract decision points from tables or bullet lists
         # Pattern for table rows: | Decision | Options | Choice | Rationale |
-        decision_table_pattern = r'\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|'
-        decision_rows = re.findall(decision_table_pattern, content)
-
-        for row in decision_rows:
+        for row in iter_table_rows(content, 4):
             # Skip header rows
             if 'decision' in row[0].lower() or '---' in row[0]:
                 continue
             wf.decision_points.append({
-                "decision": row[0].strip(),
-                "options": row[1].strip() if len(row) > 1 else None,
-                "choice": row[2].strip() if len(row) > 2 else None,
-                "rationale": row[3].strip() if len(row) > 3 else None
+                "decision": row[0],
+                "options": row[1],
+                "choice": row[2],
+                "rationale": row[3]
             })
 
         # Also extract key decisions in format: - **Decision** -> **Choice** -> **Why**
-        key_decision_pattern = r'-\s*\*?\*?([^*\n]+)\*?\*?\s*->\s*([^->]+)\s*(?:->\s*(.+))?'
-        key_decisions = re.findall(key_decision_pattern, content)
+        key_decisions = WF_KEY_DECISION_RE.findall(content)
         for kd in key_decisions:
             wf.decision_points.append({
                 "decision": kd[0].strip(),
@@ -504,42 +648,34 @@ class ContentExtractor:
     def extract_code_blocks(content: str) -> list[dict]:
         """Extract code blocks with metadata."""
         blocks = []
-
-        # Pattern for fenced code blocks with optional language
-        code_pattern = r'```(\w*)\n(.*?)```'
-        matches = re.findall(code_pattern, content, re.DOTALL)
-
-        # Track headings to associate with code blocks
-        lines = content.split('\n')
-        current_heading = None
-
-        for i, line in enumerate(lines):
-            if line.startswith('###'):
-                current_heading = line.lstrip('#').strip()
-            elif line.startswith('```'):
-                # Find the matching code block
-                for lang, code in matches:
-                    if code.strip() in content[content.find(line):]:
-                        # Check for reusability markers nearby
-                        context_start = max(0, content.find(line) - 500)
-                        context = content[context_start:content.find(line) + len(code) + 500]
-
-                        reuse_flag = bool(re.search(
-                            r'\[x\]\s*(?:Definitely|Likely)\s*reusable|'
-                            r'reusable|'
-                            r'should.*become.*skill.*\[x\]',
-                            context, re.IGNORECASE
-                        ))
-
-                        blocks.append({
-                            "language": lang if lang else None,
-                            "code": code.strip(),
-                            "heading": current_heading,
-                            "reuse_flag": reuse_flag,
-                            "notes": None
-                        })
-                        matches.remove((lang, code))
-                        break
+        if '```' not in content:
+            return blocks
+
+        fences = list(CODE_FENCE_RE.finditer(content))
+        if not fences:
+            return blocks
+
+        # Track headings by offset to associate with code blocks
+        heading_starts = []
+        heading_names = []
+        for m in CODE_HEADING_RE.finditer(content):
+            heading_starts.append(m.start())
+            heading_names.append(m.group().lstrip('#').strip())
+
+        for m in fences:
+            idx = bisect_right(heading_starts, m.start()) - 1
+
+            # Check for reusability markers nearby
+            context = content[max(0, m.start() - CODE_CONTEXT_CHARS):m.end() + CODE_CONTEXT_CHARS]
+
+            lang, code = m.groups()
+            blocks.append({
+                "language": lang if lang else None,
+                "code": code.strip(),
+                "heading": heading_names[idx] if idx >= 0 else None,
+                "reuse_flag": bool(CODE_REUSE_RE.search(context)),
+                "notes": None
+            })
 
         return blocks
 
@@ -549,32 +685,30 @@ class ContentExtractor:
         artifacts = []
 
         # Table format: | Filename | Format | Purpose | Template Potential |
-        table_pattern = r'\|\s*`?([^|`]+)`?\s*\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|(?:\s*([^|]+)\s*\|)?'
-        rows = re.findall(table_pattern, content)
-
-        for row in rows:
-            name = row[0].strip()
-            # Skip header rows
-            if 'filename' in name.lower() or 'file' in name.lower() and 'change' in row[1].lower():
+        for row in iter_table_rows(content, 3):
+            name = row[0].strip('`').strip()
+            name_lower = name.lower()
+            # Skip header rows: | Filename | ... | or | File | Change | ... |
+            if 'filename' in name_lower or ('file' in name_lower and 'change' in row[1].lower()):
                 continue
             if '---' in name:
                 continue
 
             template_potential = False
-            if len(row) > 3 and row[3]:
-                template_potential = '[x]' in row[3].lower() or 'yes' in row[3].lower()
+            if len(row) > 3:
+                potential_lower = row[3].lower()
+                template_potential = '[x]' in potential_lower or 'yes' in potential_lower
 
             artifacts.append({
                 "name": name,
-                "type": row[1].strip() if len(row) > 1 else None,
+                "type": row[1],
                 "path_hint": None,
                 "template_potential": template_potential,
-                "notes": row[2].strip() if len(row) > 2 else None
+                "notes": row[2]
             })
 
         # Also extract from Modified files section
-        modified_pattern = r'-\s*`?([^`\n:]+(?:\.(?:py|js|ts|html|css|json|md|yaml|yml|xml))?)`?(?:\s*[-:]?\s*(.+))?'
-        modified = re.findall(modified_pattern, content)
+        modified = MODIFIED_FILE_RE.findall(content)
 
         for mod in modified:
             name = mod[0].strip()
@@ -594,55 +728,39 @@ class ContentExtractor:
         """Extract issues and fixes."""
         issues = []
 
-        # Skip words that indicate non-issue entries
-        skip_words = [
-            'tests', 'validation', 'success criteria', 'pr/diff', 'scripts',
-            'snippets', 'configs', 'docs updated', 'template', 'utility',
-            'storage', 'saved as', 'location', 'artifacts', 'modified files',
-            'environment', 'starting state'
-        ]
-
         def is_valid_issue(text: str) -> bool:
             """Check if text looks like a valid issue description."""
-            text_lower = text.lower().strip()
             # Skip if starts with common non-issue patterns
-            if text_lower.startswith('**'):
+            if text.lstrip().startswith('**'):
+                return False
+            if ISSUE_SKIP_WORDS_RE.search(text):
                 return False
-            for skip in skip_words:
-                if skip in text_lower:
-                    return False
             # Must have some meaningful content
             return len(text) > 5
 
         # Table format: | Issue | Root Cause | Fix |
-        table_pattern = r'\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|\s*([^|]+)\s*\|'
-        rows = re.findall(table_pattern, content)
-
-        for row in rows:
-            issue = row[0].strip()
+        for row in iter_table_rows(content, 3):
+            issue = row[0]
+            issue_lower = issue.lower()
             # Skip header rows and separator rows
-            if 'issue' in issue.lower() or '---' in issue or 'symptom' in issue.lower():
+            if 'issue' in issue_lower or '---' in issue or 'symptom' in issue_lower:
                 continue
             if not is_valid_issue(issue):
                 continue
 
             issues.append({
                 "issue": issue,
-                "cause": row[1].strip() if len(row) > 1 else None,
-                "fix": row[2].strip() if len(row) > 2 else None,
+                "cause": row[1],
+                "fix": row[2],
                 "prevention": None,
                 "references": []
             })
 
         # Also extract from bullet format within Issues section
-        issues_section = re.search(
-            r'##\s*Issues?[^#]*?(?=##|$)',
-            content, re.IGNORECASE | re.DOTALL
-        )
+        issues_section = ISSUES_SECTION_RE.search(content)
         if issues_section:
             issues_content = issues_section.group(0)
-            bullet_pattern = r'-\s*([^->:\n]+)\s*(?:->|:)\s*([^->\n]+)(?:\s*->\s*(.+))?'
-            bullets = re.findall(bullet_pattern, issues_content)
+            bullets = ISSUE_BULLET_RE.findall(issues_content)
 
             for bullet in bullets:
                 issue_text = bullet[0].strip()
@@ -666,30 +784,65 @@ class ContentExtractor:
             "success_criteria_met": []
         }
 
-        # Tests run pattern
-        tests_pattern = r'-\s*([^:\n]+):\s*([^\n]+)'
-        tests = re.findall(tests_pattern, content)
-        for test in tests:
-            verification["checks"].append({
-                "test": test[0].strip(),
-                "result": test[1].strip()
-            })
+        checks = verification["checks"]
+        criteria = verification["success_criteria_met"]
+        expected = verification["expected_results"]
+        # Expected results: the '-' bullets after the first **After fix**: or
+        # **Expected**: marker that has any. Blank lines and indentation may
+        # precede the first bullet; later ones must start the line.
+        awaiting = in_expected = expected_done = False
+
+        for line in content.splitlines():
+            stripped = line.lstrip()
+
+            in_block = False
+            if awaiting:
+                if stripped:
+                    awaiting = False
+                    text = stripped[1:].strip() if stripped[:1] == '-' else ''
+                    if text:
+                        expected.append(text)
+                        in_expected = in_block = True
+            elif in_expected:
+                text = line[1:].strip() if line[:1] == '-' else ''
+                if text:
+                    expected.append(text)
+                    in_block = True
+                else:
+                    in_expected = False
+                    expected_done = True
+
+            if not (expected_done or in_block or awaiting) and '**' in line:
+                for marker in VERIFY_EXPECTED_MARKER_RE.finditer(line):
+                    rest = line[marker.end():].strip()
+                    if not rest:
+                        awaiting = True
+                        break
+                    if rest[:1] == '-' and rest[1:].strip():
+                        expected.append(rest[1:].strip())
+                        in_expected = True
+                        break
 
-        # Success criteria
-        criteria_pattern = r'-\s*\[([x ])\]\s*(.+)'
-        criteria = re.findall(criteria_pattern, content, re.IGNORECASE)
-        for mark, criterion in criteria:
-            verification["success_criteria_met"].append({
-                "criterion": criterion.strip(),
-                "met": mark.lower() == 'x'
-            })
+            if stripped.startswith('-'):
+                item = stripped[1:].lstrip()
 
-        # Expected results section
-        expected_pattern = r'\*\*(?:After fix|Expected)\*\*:\s*\n?((?:-[^\n]+\n?)+)'
-        match = re.search(expected_pattern, content, re.IGNORECASE)
-        if match:
-            results = re.findall(r'-\s*(.+)', match.group(1))
-            verification["expected_results"] = [r.strip() for r in results]
+                # Success criteria: - [x] criterion
+                if item[:1] == '[' and item[2:3] == ']' and item[1:2] in ('x', 'X', ' '):
+                    criterion = item[3:].strip()
+                    if criterion:
+                        criteria.append({
+                            "criterion": criterion,
+                            "met": item[1] != ' '
+                        })
+
+                # Tests run: - test: result
+                test, sep, result = item.partition(':')
+                result = result.strip()
+                if sep and test and result:
+                    checks.append({
+                        "test": test.strip(),
+                        "result": result
+                    })
 
         return verification
 
@@ -699,34 +852,23 @@ class ContentExtractor:
         assessment = SkillAssessment()
 
         # Extract individual scores from table
-        score_patterns = {
-            'frequency': r'Frequency[^|]*\|\s*(\d)',
-            'consistency': r'Consistency[^|]*\|\s*(\d)',
-            'complexity': r'Complexity[^|]*\|\s*(\d)',
-            'codifiability': r'Codifiability[^|]*\|\s*(\d)',
-            'toolability': r'Tool-?ability[^|]*\|\s*(\d)',
-        }
-
-        for field, pattern in score_patterns.items():
-            match = re.search(pattern, content, re.IGNORECASE)
+        for field, regex in SCORE_RES.items():
+            match = regex.search(content)
             if match:
                 setattr(assessment, f'{field}_score', int(match.group(1)))
 
         # Total score
-        total_pattern = r'(?:TOTAL|Total)[^|]*\|\s*(\d+)'
-        match = re.search(total_pattern, content)
+        match = TOTAL_SCORE_RE.search(content)
         if match:
             assessment.reusability_score = int(match.group(1))
 
         # Extraction priority
-        priority_pattern = r'\[x\]\s*\*?\*?(\w+)\s*Priority'
-        match = re.search(priority_pattern, content, re.IGNORECASE)
+        match = PRIORITY_RE.search(content)
         if match:
             assessment.extraction_priority = match.group(1).lower()
 
         # Simple skill potential
-        potential_pattern = r'Skill Potential:\s*(\w+)'
-        match = re.search(potential_pattern, content, re.IGNORECASE)
+        match = SKILL_POTENTIAL_RE.search(content)
         if match:
             potential = match.group(1).lower()
             if potential == 'high':
@@ -737,8 +879,7 @@ class ContentExtractor:
                 assessment.extraction_priority = 'low'
 
         # Notes
-        notes_pattern = r'\*\*Notes?\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)'
-        match = re.search(notes_pattern, content, re.IGNORECASE)
+        match = NOTES_RE.search(content)
         if match:
             assessment.notes = match.group(1).strip()
 
@@ -751,56 +892,22 @@ class ContentExtractor:
 
         # Pattern for tag lines: Languages: Python, JavaScript | Domain: ...
         # Or: **Languages**: Python, JavaScript
-
-        # Languages
-        lang_pattern = r'(?:\*\*)?Languages?(?:\*\*)?:\s*([^|\n]+)'
-        match = re.search(lang_pattern, content, re.IGNORECASE)
-        if match:
-            raw_tags = re.split(r'[,;]', match.group(1))
-            tags.languages = [normalize_tag(t) for t in raw_tags if t.strip()]
-
-        # Frameworks
-        fw_pattern = r'(?:\*\*)?Frameworks?(?:/Libs?)?(?:\*\*)?:\s*([^|\n]+)'
-        match = re.search(fw_pattern, content, re.IGNORECASE)
-        if match:
-            raw_tags = re.split(r'[,;]', match.group(1))
-            tags.frameworks = [normalize_tag(t) for t in raw_tags if t.strip()]
-
-        # Domain
-        domain_pattern = r'(?:\*\*)?Domains?(?:\*\*)?:\s*([^|\n]+)'
-        match = re.search(domain_pattern, content, re.IGNORECASE)
-        if match:
-            raw_tags = re.split(r'[,;]', match.group(1))
-            tags.domains = [normalize_tag(t) for t in raw_tags if t.strip()]
-
-        # Services
-        services_pattern = r'(?:\*\*)?(?:External\s*)?Services?(?:\*\*)?:\s*([^|\n]+)'
-        match = re.search(services_pattern, content, re.IGNORECASE)
-        if match:
-            raw_tags = re.split(r'[,;]', match.group(1))
-            tags.services = [normalize_tag(t) for t in raw_tags if t.strip() and t.strip().lower() != 'none']
-
-        # Patterns
-        pattern_pattern = r'(?:\*\*)?Patterns?(?:\*\*)?:\s*([^|\n]+)'
-        match = re.search(pattern_pattern, content, re.IGNORECASE)
-        if match:
-            raw_tags = re.split(r'[,;]', match.group(1))
-            tags.patterns = [normalize_tag(t) for t in raw_tags if t.strip()]
-
-        # Tools (from Operational or Tools field)
-        tools_pattern = r'(?:\*\*)?(?:Tools?|Operational)(?:\*\*)?:\s*([^|\n]+)'
-        match = re.search(tools_pattern, content, re.IGNORECASE)
-        if match:
-            raw_tags = re.split(r'[,;]', match.group(1))
-            tags.tools = [normalize_tag(t) for t in raw_tags if t.strip()]
-
-        # Deduplicate all tag lists
-        tags.languages = deduplicate_list(tags.languages)
-        tags.frameworks = deduplicate_list(tags.frameworks)
-        tags.domains = deduplicate_list(tags.domains)
-        tags.services = deduplicate_list(tags.services)
-        tags.patterns = deduplicate_list(tags.patterns)
-        tags.tools = deduplicate_list(tags.tools)
+        # Tools come from either the Operational or the Tools field.
+        found = set()
+        for key_match in TAG_KEY_RE.finditer(content):
+            field_name = key_match.lastgroup
+            if field_name in found:
+                continue
+            match = TAG_VALUE_RE.match(content, key_match.end())
+            if not match:
+                continue
+            raw_tags = TAG_SPLIT_RE.split(match.group(1))
+            if field_name == 'services':
+                raw_tags = [t for t in raw_tags if t.strip().lower() != 'none']
+            setattr(tags, field_name, normalize_tag_list(raw_tags))
+            found.add(field_name)
+            if len(found) == len(TAG_KEY_RE.groupindex):
+                break
 
         return tags
 
@@ -815,36 +922,33 @@ class ContentExtractor:
             "notes": None
         }
 
+        # Every knowledge field starts with a bold key
+        if '**' not in content:
+            return knowledge
+
         # Database knowledge
-        db_pattern = r'\*\*(?:DB|Database)[^*]*\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)'
-        match = re.search(db_pattern, content, re.IGNORECASE)
+        match = KNOWLEDGE_DB_RE.search(content)
         if match:
             knowledge["db_knowledge"] = match.group(1).strip()
-            knowledge["sources"].append({"type": "database", "detail": match.group(1).strip()})
+            knowledge["sources"].append(KnowledgeSource("database", knowledge["db_knowledge"]))
 
         # API knowledge
-        api_pattern = r'\*\*API[^*]*\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)'
-        match = re.search(api_pattern, content, re.IGNORECASE)
+        match = KNOWLEDGE_API_RE.search(content)
         if match:
             knowledge["api_knowledge"] = match.group(1).strip()
-            knowledge["sources"].append({"type": "api", "detail": match.group(1).strip()})
+            knowledge["sources"].append(KnowledgeSource("api", knowledge["api_knowledge"]))
 
         # Codebase/Code patterns
-        code_pattern = r'\*\*(?:Code(?:base)?|Code patterns?)[^*]*\*\*:\s*([^\n]+(?:\n(?!\*\*)[^\n]+)*)'
-        match = re.search(code_pattern, content, re.IGNORECASE)
+        match = KNOWLEDGE_CODE_RE.search(content)
         if match:
             knowledge["codebase_knowledge"] = match.group(1).strip()
-            knowledge["sources"].append({"type": "codebase", "detail": match.group(1).strip()})
+            knowledge["sources"].append(KnowledgeSource("codebase", knowledge["codebase_knowledge"]))
 
         # Extract bullet points as sources
-        bullet_pattern = r'-\s*\*\*([^*]+)\*\*:\s*([^\n]+)'
-        bullets = re.findall(bullet_pattern, content)
+        bullets = KNOWLEDGE_BULLET_RE.findall(content)
         for category, detail in bullets:
             if category.lower() not in ['db', 'database', 'api', 'code', 'codebase', 'code patterns']:
-                knowledge["sources"].append({
-                    "type": category.strip().lower(),
-                    "detail": detail.strip()
-                })
+                knowledge["sources"].append(KnowledgeSource(category.strip().lower(), detail.strip()))
 
         return knowledge
 
@@ -853,6 +957,26 @@ class ContentExtractor:
 # Main Extractor Class
 # =============================================================================
 
+# Substrings that route extra (non-canonical) sections into each extraction
+SECTION_KEY_BUCKETS = {
+    'workflow': ('work', 'step'),
+    'outputs': ('file', 'artifact', 'modified'),
+    'results': ('expected', 'result'),
+    'assessment': ('skill', 'reusab', 'tags'),
+}
+
+
+def bucket_section_keys(sections: dict) -> dict[str, list[str]]:
+    """Classify section names into SECTION_KEY_BUCKETS in one pass, keeping section order."""
+    buckets = {bucket: [] for bucket in SECTION_KEY_BUCKETS}
+    for key in sections:
+        key_lower = key.lower()
+        for bucket, words in SECTION_KEY_BUCKETS.items():
+            if any(word in key_lower for word in words):
+                buckets[bucket].append(key)
+    return buckets
+
+
 class SRPTDExtractor:
     """Main extractor class that orchestrates the extraction process."""
 
@@ -889,6 +1013,7 @@ class SRPTDExtractor:
         # Extract sections
         sections = self.parser.extract_sections()
         extraction.raw_sections = sections
+        section_keys = bucket_section_keys(sections)
 
         # Extract metadata from header
         header_content = sections.get('header', '') + '\n' + self.content[:1000]
@@ -904,9 +1029,9 @@ class SRPTDExtractor:
 
         # If no trigger found in dedicated section, check header for blockquotes
         if not extraction.trigger.what_triggered:
-            quote_match = re.search(r'>\s*(.+?)(?=\n(?!>)|$)', self.content[:2000], re.DOTALL)
-            if quote_match:
-                extraction.trigger.what_triggered = quote_match.group(1).strip()
+            quote = first_blockquote(self.content, 2000)
+            if quote is not None:
+                extraction.trigger.what_triggered = quote.strip()
 
         # For legacy format, use Objective as trigger if no explicit trigger found
         if not extraction.trigger.what_triggered and extraction.context_inputs.objective:
@@ -924,12 +1049,9 @@ class SRPTDExtractor:
 
         # Extract workflow
         workflow_content = sections.get('workflow', '')
-        if not workflow_content:
+        if not workflow_content and section_keys['workflow']:
             # Check for Work Performed in legacy format
-            for key in sections:
-                if 'work' in key.lower() or 'step' in key.lower():
-                    workflow_content = sections[key]
-                    break
+            workflow_content = sections[section_keys['workflow'][0]]
 
         # For legacy format, workflow steps might be in the header section
         if not workflow_content and self.parser.format == 'legacy':
@@ -956,25 +1078,19 @@ class SRPTDExtractor:
         # Also extract from entire document to catch all code blocks
         all_code_blocks = self.extractor.extract_code_blocks(self.content)
 
-        # Merge and deduplicate
-        seen_codes = set()
-        merged_blocks = []
-        for block in code_blocks + all_code_blocks:
-            code_hash = hashlib.md5(block['code'].encode()).hexdigest()
-            if code_hash not in seen_codes:
-                seen_codes.add(code_hash)
-                merged_blocks.append(block)
+        # Merge and deduplicate on the code text (section blocks win)
+        merged_blocks = {}
+        for block in chain(code_blocks, all_code_blocks):
+            merged_blocks.setdefault(block['code'], block)
 
-        extraction.code_written = {"blocks": merged_blocks}
+        extraction.code_written = {"blocks": list(merged_blocks.values())}
 
         # Extract artifacts/outputs
-        outputs_content = sections.get('outputs', sections.get('artifacts', ''))
+        outputs_parts = [sections.get('outputs', sections.get('artifacts', ''))]
         # Also check Files Modified section
-        for key in sections:
-            if 'file' in key.lower() or 'artifact' in key.lower() or 'modified' in key.lower():
-                outputs_content += '\n' + sections[key]
+        outputs_parts.extend(sections[key] for key in section_keys['outputs'])
 
-        extraction.outputs_produced = {"artifacts": self.extractor.extract_artifacts(outputs_content)}
+        extraction.outputs_produced = {"artifacts": self.extractor.extract_artifacts('\n'.join(outputs_parts))}
 
         # Extract issues
         issues_content = sections.get('issues', '')
@@ -985,26 +1101,23 @@ class SRPTDExtractor:
         extraction.verification = self.extractor.extract_verification(verification_content)
 
         # Also check for expected results
-        for key in sections:
-            if 'expected' in key.lower() or 'result' in key.lower():
-                ver = self.extractor.extract_verification(sections[key])
-                extraction.verification["expected_results"].extend(ver.get("expected_results", []))
+        for key in section_keys['results']:
+            ver = self.extractor.extract_verification(sections[key])
+            extraction.verification["expected_results"].extend(ver.get("expected_results", []))
 
         # Extract skill assessment - search entire document for scores
-        assessment_content = sections.get('skill_assessment', sections.get('skill_potential', ''))
+        assessment_parts = [sections.get('skill_assessment', sections.get('skill_potential', ''))]
         # Also check for reusability score anywhere in the document
-        for key in sections:
-            if 'skill' in key.lower() or 'reusab' in key.lower() or 'tags' in key.lower():
-                assessment_content += '\n' + sections[key]
-        # Also scan the entire document for skill assessment tables
-        if 'Dimension' in self.content and 'Score' in self.content:
-            assessment_content += '\n' + self.content
-        extraction.skill_assessment = self.extractor.extract_skill_assessment(assessment_content)
+        assessment_parts.extend(sections[key] for key in section_keys['assessment'])
+        # Also scan the document's skill assessment table
+        skill_table = self._skill_table_slice()
+        if skill_table is not None:
+            assessment_parts.append(skill_table)
+        extraction.skill_assessment = self.extractor.extract_skill_assessment('\n'.join(assessment_parts))
 
         # Extract tags
-        tags_content = sections.get('tags', '')
         # Also check end of document for inline tags
-        tags_content += '\n' + self.content[-1000:]
+        tags_content = sections.get('tags', '') + '\n' + self.content[-1000:]
         extraction.tags = self.extractor.extract_tags(tags_content)
 
         # Generate parse warnings
@@ -1012,6 +1125,14 @@ class SRPTDExtractor:
 
         return extraction
 
+    def _skill_table_slice(self) -> Optional[str]:
+        """Return the skill assessment table, from its header row to its last row.
+
+        Returns None if no table row names both 'Dimension' and 'Score'.
+        """
+        match = SKILL_TABLE_RE.search(self.content)
+        return match.group(0) if match else None
+
     def _generate_warnings(self, extraction: SRPTDExtraction) -> list[str]:
         """Generate warnings for missing or incomplete data."""
         warnings = []
@@ -1041,8 +1162,114 @@ class SRPTDExtractor:
 # Batch Processing
 # =============================================================================
 
-def process_directory(input_dir: str, output_dir: str, pattern: str = "*.md") -> dict:
-    """Process all SR-PTD files in a directory."""
+def dumps_json(data) -> str:
+    """Serialize data as indented JSON text (uses orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def write_json(path: Path, data):
+    """Write data as indented JSON (uses orjson when available).
+
+    data may also be an extraction dataclass: orjson serializes those
+    natively, skipping the asdict() copy the json fallback needs.
+    """
+    if HAS_ORJSON:
+        Path(path).write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    if is_dataclass(data):
+        data = asdict(data)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _process_file(file_path: str, output_dir: str) -> dict:
+    """Extract one SR-PTD file and save its JSON (runs in a worker process)."""
+    try:
+        extractor = SRPTDExtractor(file_path)
+        if not extractor.load():
+            return {"source": file_path, "error": "Failed to load file"}
+
+        extraction = extractor.extract()
+
+        # Save JSON output
+        output_file = Path(output_dir) / f"{extraction.doc_id}.json"
+        write_json(output_file, extraction)
+
+        return {
+            "source": file_path,
+            "output": str(output_file),
+            "doc_id": extraction.doc_id,
+            "format": extraction.format_detected,
+            "warnings": extraction.parse_warnings
+        }
+    except Exception as e:
+        return {"source": file_path, "error": str(e)}
+
+
+def _file_size(file_path: str) -> int:
+    """Size of a file in bytes, or 0 if it cannot be stat'ed."""
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return 0
+
+
+# Extraction output names: <file stem>_<8 hex digit content hash>.json
+OUTPUT_NAME_RE = re.compile(r'^(.+)_[0-9a-f]{8}\.json$')
+
+
+def _recorded_source(output_file: str) -> Optional[str]:
+    """Resolved source_path recorded in an extraction JSON, or None."""
+    try:
+        with open(output_file, 'rb') as f:
+            data = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
+        return os.path.realpath(data["source_path"])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def remove_stale_outputs(output_dir: Path, written: list[tuple[str, str]]) -> list[str]:
+    """Delete earlier extractions of the documents just re-extracted.
+
+    A doc id is the file stem plus a content hash, so editing a document
+    leaves its previous JSON behind under another name, where later phases
+    would load it as a duplicate doc card. ``written`` holds the (source,
+    output) pairs of this run. Another output sharing a written stem is
+    removed only when the source_path recorded in it is one of the sources
+    just re-extracted, so a same-named document elsewhere keeps its
+    extraction.
+    """
+    written_paths = {os.path.normpath(output) for _, output in written}
+    sources = {os.path.realpath(source) for source, _ in written}
+    stems = set()
+    for _, output in written:
+        match = OUTPUT_NAME_RE.match(Path(output).name)
+        if match:
+            stems.add(match.group(1))
+
+    removed = []
+    if not stems:
+        return removed
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            match = OUTPUT_NAME_RE.match(entry.name)
+            if (match and match.group(1) in stems
+                    and os.path.normpath(entry.path) not in written_paths
+                    and _recorded_source(entry.path) in sources):
+                os.remove(entry.path)
+                removed.append(entry.path)
+    return removed
+
+
+def process_directory(input_dir: str, output_dir: str, pattern: str = "*.md",
+                      workers: Optional[int] = None) -> dict:
+    """Process all SR-PTD files in a directory.
+
+    Files are independent, so they are extracted in parallel across
+    ``workers`` processes (default: one per CPU).
+    """
     input_path = Path(input_dir)
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -1050,50 +1277,49 @@ def process_directory(input_dir: str, output_dir: str, pattern: str = "*.md") ->
     results = {
         "processed": [],
         "failed": [],
+        "stale_removed": [],
         "total": 0
     }
 
-    # Find all matching files
-    files = list(input_path.glob(pattern))
-    # Also check subdirectories
-    files.extend(input_path.glob(f"**/{pattern}"))
-
-    # Filter to only SR-PTD and task_doc files
+    # Find all matching files, including subdirectories, in a single walk,
+    # keeping only SR-PTD and task_doc files
     srptd_files = [
-        f for f in files
+        str(f) for f in input_path.rglob(pattern)
         if f.name.startswith(('SR-PTD', 'task_doc'))
     ]
 
     results["total"] = len(srptd_files)
 
-    for file_path in srptd_files:
-        try:
-            extractor = SRPTDExtractor(str(file_path))
-            if extractor.load():
-                extraction = extractor.extract()
-
-                # Save JSON output
-                output_file = output_path / f"{extraction.doc_id}.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(extraction.to_dict(), f, indent=2, ensure_ascii=False)
-
-                results["processed"].append({
-                    "source": str(file_path),
-                    "output": str(output_file),
-                    "doc_id": extraction.doc_id,
-                    "format": extraction.format_detected,
-                    "warnings": extraction.parse_warnings
-                })
-            else:
-                results["failed"].append({
-                    "source": str(file_path),
-                    "error": "Failed to load file"
-                })
-        except Exception as e:
-            results["failed"].append({
-                "source": str(file_path),
-                "error": str(e)
-            })
+    # Largest files first: workers pull tasks as they free up, so a big
+    # document queued last cannot leave the rest of the pool idle.
+    srptd_files.sort(key=lambda f: (-_file_size(f), f))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    workers = min(workers, len(srptd_files))
+    if workers > 1:
+        # Deferred: pulls in multiprocessing, which single-file runs never need
+        from concurrent.futures import ProcessPoolExecutor
+
+        # One file per task: larger chunks would be contiguous runs of the
+        # sorted list, handing all the biggest files to a single worker.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(
+                _process_file, srptd_files, repeat(str(output_path)), chunksize=1
+            ))
+    else:
+        outcomes = map(_process_file, srptd_files, repeat(str(output_path)))
+
+    for outcome in outcomes:
+        if "error" in outcome:
+            results["failed"].append(outcome)
+        else:
+            results["processed"].append(outcome)
+
+    results["stale_removed"] = remove_stale_outputs(
+        output_path, [(item["source"], item["output"]) for item in results["processed"]])
 
     return results
 
@@ -1113,8 +1339,8 @@ def process_single_file(input_file: str, output_dir: str = None) -> dict:
         output_path.mkdir(parents=True, exist_ok=True)
         output_file = output_path / f"{extraction.doc_id}.json"
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_json(output_file, result)
+        remove_stale_outputs(output_path, [(input_file, str(output_file))])
 
         result["_output_file"] = str(output_file)
 
@@ -1125,6 +1351,19 @@ def process_single_file(input_file: str, output_dir: str = None) -> dict:
 # CLI Interface
 # =============================================================================
 
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    import argparse
+
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     """Command-line interface for the extractor."""
     import argparse
@@ -1162,6 +1401,13 @@ def main():
         help="Print extraction summary to console"
     )
 
+    parser.add_argument(
+        "-w", "--workers",
+        type=_positive_int,
+        default=None,
+        help="Worker processes for directory processing (default: one per CPU)"
+    )
+
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -1208,11 +1454,12 @@ def main():
             if result.get('_output_file'):
                 print(f"\nSaved to: {result['_output_file']}")
         else:
-            print(json.dumps(result, indent=2, ensure_ascii=False))
+            print(dumps_json(result))
 
     else:
         # Directory processing
-        results = process_directory(str(input_path), args.output, args.pattern)
+        results = process_directory(str(input_path), args.output, args.pattern,
+                                    workers=args.workers)
 
         print(f"\n{'='*60}")
         print(f"SR-PTD Layer 1 Extraction Results")
@@ -1220,6 +1467,8 @@ def main():
         print(f"Total files found: {results['total']}")
         print(f"Successfully processed: {len(results['processed'])}")
         print(f"Failed: {len(results['failed'])}")
+        if results['stale_removed']:
+            print(f"Removed stale extractions: {len(results['stale_removed'])}")
 
         if results['processed']:
             print(f"\nProcessed files:")
@@ -1234,8 +1483,7 @@ def main():
 
         # Save summary
         summary_file = Path(args.output) / "_extraction_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        write_json(summary_file, results)
         print(f"\nSummary saved to: {summary_file}")
 
 
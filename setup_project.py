@@ -17,6 +17,12 @@ import shutil
 import argparse
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 EXAMPLE_SRPTD = '''# SR-PTD: Example Task Documentation
 
@@ -180,6 +186,15 @@ CONFIG_TEMPLATE = {
 }
 
 
+def write_json(path: Path, data) -> None:
+    """Write data as indented UTF-8 JSON (uses orjson when available)."""
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+
 def setup_project(project_dir: Path, with_examples: bool = False):
     """Set up project structure."""
 
@@ -210,8 +225,7 @@ def setup_project(project_dir: Path, with_examples: bool = False):
     # Create config.json
     config_file = project_dir / "config.json"
     if not config_file.exists():
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(CONFIG_TEMPLATE, f, indent=2, ensure_ascii=False)
+        write_json(config_file, CONFIG_TEMPLATE)
         print(f"  Created: config.json")
     else:
         print(f"  Exists:  config.json")
@@ -223,7 +237,7 @@ def setup_project(project_dir: Path, with_examples: bool = False):
 .env
 *.pyc
 __pycache__/
-.pipeline_progress.json
+.pipeline_progress.jsonl
 
 # Output directories (optional - uncomment if you don't want to track)
 # extractions/
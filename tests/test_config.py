@@ -0,0 +1,40 @@
+"""Tests for scripts/config.py."""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import config  # noqa: E402
+
+
+class LoadConfigTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / "config.json"
+        self.path.write_text(json.dumps({
+            "domain_vocabulary": ["testing", "devops"],
+            "domain_rollups": {"infra": ["devops"]},
+        }))
+
+    def test_mutating_a_loaded_config_does_not_leak_into_reloads(self):
+        loaded = config.load_config(self.path)
+        loaded["domain_vocabulary"].append("leaked")
+        loaded["domain_rollups"]["infra"].append("leaked")
+
+        pipeline_cfg = config.PipelineConfig(self.path)
+        pipeline_cfg.domain_vocabulary.append("leaked")
+
+        reloaded = config.load_config(self.path)
+        self.assertEqual(reloaded["domain_vocabulary"], ["testing", "devops"])
+        self.assertEqual(reloaded["domain_rollups"], {"infra": ["devops"]})
+        self.assertEqual(config.PipelineConfig(self.path).domain_vocabulary, ["testing", "devops"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+"""Tests for scripts/layer1_extractor.py."""
+
+import io
+import sys
+import tempfile
+import unittest
+import concurrent.futures
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import layer1_extractor  # noqa: E402
+
+
+class RecordingExecutor:
+    """Stand-in for ProcessPoolExecutor that runs tasks inline and records dispatch."""
+
+    calls = []
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, fn, *iterables, chunksize=1):
+        args = list(zip(*iterables))
+        RecordingExecutor.calls.append({"files": [a[0] for a in args], "chunksize": chunksize})
+        return [fn(*a) for a in args]
+
+
+class ProcessDirectoryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.input_dir = root / "in"
+        self.output_dir = root / "out"
+        self.input_dir.mkdir()
+        RecordingExecutor.calls = []
+
+    def _write_doc(self, name: str, padding: int) -> str:
+        path = self.input_dir / name
+        path.write_text(f"# SR-PTD: {name}\n\n## Section A\n{'x' * padding}\n", encoding="utf-8")
+        return str(path)
+
+    def test_largest_files_dispatched_first_one_per_task(self):
+        # Enough files that a len // (4 * workers) chunksize would exceed 1
+        sizes = {f"SR-PTD_{i:02d}.md": (i * 37) % 20 * 100 + i for i in range(24)}
+        paths = {name: self._write_doc(name, pad) for name, pad in sizes.items()}
+
+        with mock.patch.object(concurrent.futures, "ProcessPoolExecutor", RecordingExecutor):
+            results = layer1_extractor.process_directory(
+                str(self.input_dir), str(self.output_dir), workers=2)
+
+        self.assertEqual(len(RecordingExecutor.calls), 1)
+        call = RecordingExecutor.calls[0]
+        expected = [paths[n] for n in sorted(sizes, key=lambda n: -sizes[n])]
+        self.assertEqual(call["files"], expected)
+        # Chunks are contiguous slices of the sorted list, so anything larger
+        # than one file per task would give one worker all the biggest files.
+        self.assertEqual(call["chunksize"], 1)
+        self.assertEqual(len(results["processed"]), len(sizes))
+        self.assertEqual(results["failed"], [])
+
+    def test_workers_below_one_are_rejected(self):
+        self._write_doc("SR-PTD_a.md", 10)
+        for workers in (0, -2):
+            with self.assertRaises(ValueError):
+                layer1_extractor.process_directory(
+                    str(self.input_dir), str(self.output_dir), workers=workers)
+
+            argv = ["layer1_extractor.py", str(self.input_dir), "--workers", str(workers)]
+            stderr = io.StringIO()
+            with mock.patch.object(sys, "argv", argv), mock.patch.object(sys, "stderr", stderr):
+                with self.assertRaises(SystemExit) as cm:
+                    layer1_extractor.main()
+            self.assertEqual(cm.exception.code, 2)
+            self.assertIn("must be at least 1", stderr.getvalue())
+        self.assertEqual(RecordingExecutor.calls, [])
+
+
+class SkillTableSliceTest(unittest.TestCase):
+
+    def _extract(self, content: str):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "SR-PTD_table.md"
+            path.write_text(content, encoding="utf-8")
+            extractor = layer1_extractor.SRPTDExtractor(str(path))
+            self.assertTrue(extractor.load())
+            return extractor, extractor.extract()
+
+    def test_prose_mention_of_dimension_before_table(self):
+        content = (
+            "# SR-PTD: Feature work\n\n"
+            "## Background\n"
+            "Dimension reduction was considered but the Score was not recorded here.\n"
+            "More prose follows.\n\n"
+            "## Appendix\n\n"
+            "| Dimension | Score (1-5) | Notes |\n"
+            "|-----------|-------------|-------|\n"
+            "| Frequency | 4 | Often needed |\n"
+            "| Consistency | 3 | Mostly the same |\n"
+            "| Codifiability | 5 | Clear steps |\n"
+        )
+        extractor, extraction = self._extract(content)
+
+        table = extractor._skill_table_slice()
+        self.assertTrue(table.startswith("| Dimension | Score"))
+        self.assertTrue(table.endswith("| Codifiability | 5 | Clear steps |"))
+        self.assertEqual(extraction.skill_assessment.frequency_score, 4)
+        self.assertEqual(extraction.skill_assessment.consistency_score, 3)
+        self.assertEqual(extraction.skill_assessment.codifiability_score, 5)
+
+    def test_no_table_row_returns_none(self):
+        content = "# SR-PTD: Notes\n\nDimension and Score are mentioned only in prose.\n"
+        extractor, _ = self._extract(content)
+        self.assertIsNone(extractor._skill_table_slice())
+
+
+class ExtractVerificationTest(unittest.TestCase):
+    """Expected-result cases, with values from the regex-based extractor."""
+
+    extract = staticmethod(layer1_extractor.ContentExtractor.extract_verification)
+
+    def test_marker_without_bullets_does_not_hide_a_later_one(self):
+        content = "**Expected**:\nsee below\n\n**After fix**:\n- Page loads\n- No errors\n"
+        self.assertEqual(self.extract(content)["expected_results"], ["Page loads", "No errors"])
+
+    def test_expected_bullets_are_still_sorted_into_checks(self):
+        result = self.extract("**Expected**:\n- Unit tests: pass\n- Lint: clean\n")
+        self.assertEqual(result["expected_results"], ["Unit tests: pass", "Lint: clean"])
+        self.assertEqual(result["checks"], [
+            {"test": "Unit tests", "result": "pass"},
+            {"test": "Lint", "result": "clean"},
+        ])
+
+    def test_marker_inside_a_bullet(self):
+        result = self.extract("- **Expected**:\n- Build succeeds\n- Deploy works\n")
+        self.assertEqual(result["expected_results"], ["Build succeeds", "Deploy works"])
+
+    def test_indented_first_bullet(self):
+        content = "**Expected**:\n\n  - Indented first\n- second\n  - third indented\ntail\n"
+        self.assertEqual(self.extract(content)["expected_results"], ["Indented first", "second"])
+
+
+class DocIdTest(unittest.TestCase):
+
+    def test_hashes_full_content(self):
+        head, tail = "a" * 8192, "z" * 8192
+        first = layer1_extractor.generate_doc_id("SR-PTD_x.md", head + "middle-1" + tail)
+        second = layer1_extractor.generate_doc_id("SR-PTD_x.md", head + "middle-2" + tail)
+        self.assertNotEqual(first, second)
+        self.assertRegex(first, r"^SR-PTD_x_[0-9a-f]{8}$")
+
+    def test_rerun_removes_stale_extraction_of_edited_document(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            input_dir, output_dir = root / "in", root / "out"
+            input_dir.mkdir()
+            output_dir.mkdir()
+            doc = input_dir / "SR-PTD_task.md"
+            other = output_dir / "SR-PTD_task_extra_0badf00d.json"
+            other.write_text("{}", encoding="utf-8")
+
+            doc.write_text("# SR-PTD: Task\n\nfirst version\n", encoding="utf-8")
+            first = layer1_extractor.process_directory(str(input_dir), str(output_dir), workers=1)
+            doc.write_text("# SR-PTD: Task\n\nsecond version\n", encoding="utf-8")
+            second = layer1_extractor.process_directory(str(input_dir), str(output_dir), workers=1)
+
+            old_output = first["processed"][0]["output"]
+            new_output = second["processed"][0]["output"]
+            self.assertNotEqual(old_output, new_output)
+            self.assertEqual(second["stale_removed"], [old_output])
+            self.assertFalse(Path(old_output).exists())
+            self.assertTrue(Path(new_output).exists())
+            # Outputs of other documents whose names merely extend the stem stay
+            self.assertTrue(other.exists())
+
+    def test_same_stem_in_other_directory_is_kept(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            raw, output_dir = root / "raw", root / "out"
+            (raw / "a").mkdir(parents=True)
+            (raw / "b").mkdir()
+            doc_a = raw / "a" / "SR-PTD_task.md"
+            doc_b = raw / "b" / "SR-PTD_task.md"
+            doc_a.write_text("# SR-PTD: Task A\n\nfirst version\n", encoding="utf-8")
+            doc_b.write_text("# SR-PTD: Task B\n\nother document\n", encoding="utf-8")
+
+            first = layer1_extractor.process_directory(str(raw), str(output_dir), workers=1)
+            outputs = {Path(item["source"]).parent.name: item["output"] for item in first["processed"]}
+            self.assertEqual(first["stale_removed"], [])
+
+            # Re-extracting a unchanged, then edited, leaves b's extraction alone
+            layer1_extractor.process_single_file(str(doc_a), str(output_dir))
+            self.assertTrue(Path(outputs["a"]).exists())
+            self.assertTrue(Path(outputs["b"]).exists())
+
+            doc_a.write_text("# SR-PTD: Task A\n\nsecond version\n", encoding="utf-8")
+            result = layer1_extractor.process_single_file(str(doc_a), str(output_dir))
+            self.assertFalse(Path(outputs["a"]).exists())
+            self.assertTrue(Path(result["_output_file"]).exists())
+            self.assertTrue(Path(outputs["b"]).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""Tests for run_pipeline.py."""
+
+import io
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+import run_pipeline  # noqa: E402
+
+PHASE_SCRIPT = '''
+import os
+from config import MARKER
+
+calls = []
+
+
+def main():
+    calls.append(MARKER)
+    with open(os.path.join(os.getcwd(), "out.txt"), "a") as f:
+        f.write(f"{len(calls)}:{MARKER}\\n")
+    return 0
+'''
+
+
+class RunPhaseInProcessTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        scripts = self.root / "scripts"
+        scripts.mkdir()
+        (scripts / "config.py").write_text("MARKER = 'scripts'\n")
+        self.script = scripts / "phase_x.py"
+        self.script.write_text(PHASE_SCRIPT)
+
+    def test_same_phase_twice_starts_fresh(self):
+        other_config = types.ModuleType("config")
+        other_config.MARKER = "other"
+        saved = sys.modules.get("config")
+        sys.modules["config"] = other_config
+        self.addCleanup(
+            lambda: sys.modules.pop("config", None) if saved is None
+            else sys.modules.__setitem__("config", saved))
+        path_before = sys.path[:]
+        modules_before = set(sys.modules)
+
+        for _ in range(2):
+            self.assertTrue(run_pipeline._run_phase_in_process(self.script, [], {}, self.root))
+
+        # Module state did not survive between runs, and the sibling config won
+        self.assertEqual((self.root / "out.txt").read_text(), "1:scripts\n1:scripts\n")
+        self.assertEqual(sys.path, path_before)
+        self.assertEqual(set(sys.modules), modules_before)
+        self.assertIs(sys.modules["config"], other_config)
+
+    def test_phase_exception_traceback_reaches_stderr(self):
+        self.script.write_text(
+            "def load(cfg):\n"
+            "    return cfg['missing_key']\n"
+            "\n"
+            "def main():\n"
+            "    load({})\n"
+        )
+        stderr = io.StringIO()
+        with mock.patch.object(sys, "stderr", stderr), mock.patch.object(sys, "stdout", io.StringIO()):
+            self.assertFalse(run_pipeline._run_phase_in_process(self.script, [], {}, self.root))
+
+        output = stderr.getvalue()
+        self.assertIn("Traceback (most recent call last)", output)
+        self.assertIn("in load", output)
+        self.assertIn("KeyError: 'missing_key'", output)
+
+
+class CheckApiKeyTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def _check(self, env_key=None, dotenv_key=None):
+        if dotenv_key is not None:
+            (self.root / ".env").write_text(f"ANTHROPIC_API_KEY={dotenv_key}\n")
+        environ = {} if env_key is None else {"ANTHROPIC_API_KEY": env_key}
+        stdout = io.StringIO()
+        with mock.patch.dict(run_pipeline.os.environ, environ, clear=True), \
+                mock.patch.object(sys, "stdout", stdout):
+            return run_pipeline.check_api_key(self.root), stdout.getvalue()
+
+    def test_well_formed_key_is_used_silently(self):
+        key = "sk-ant-api03-" + "a" * 40
+        self.assertEqual(self._check(env_key=key), (key, ""))
+
+    def test_key_not_matching_the_pattern_is_still_used(self):
+        # The phase scripts accept any non-empty key, so this one must not skip them
+        key = "proxy-issued.key/1234"
+        api_key, output = self._check(dotenv_key=key)
+        self.assertEqual(api_key, key)
+        self.assertIn("present but malformed", output)
+
+    def test_setup_placeholder_counts_as_missing(self):
+        api_key, output = self._check(dotenv_key="sk-ant-your-api-key-here")
+        self.assertEqual(api_key, "")
+        self.assertIn("placeholder", output)
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "srptd_raw").mkdir()
+        (self.root / "srptd_raw" / "SR-PTD_a.md").write_text("# SR-PTD\n")
+
+    def _resume(self, completed, **kwargs):
+        ran = []
+
+        def fake_run_phase(phase, *args, **kw):
+            ran.append(phase["id"])
+            return True
+
+        stdout = io.StringIO()
+        with mock.patch.object(run_pipeline, "phase_completed", lambda phase, *a: phase["id"] in completed), \
+                mock.patch.object(run_pipeline, "run_phase", fake_run_phase), \
+                mock.patch.object(run_pipeline, "check_api_key", lambda root: ""), \
+                mock.patch("builtins.input", lambda prompt="": "y"), \
+                mock.patch.object(sys, "stdout", stdout):
+            run_pipeline.run_pipeline(self.root, resume=True, **kwargs)
+        return ran, stdout.getvalue()
+
+    def test_resume_point_skips_phases_that_need_a_missing_key(self):
+        ran, output = self._resume({"B", "C.0-C.1"})
+        self.assertEqual(ran[0], "C.4")
+        self.assertIn("Resuming from Phase C.4", output)
+        self.assertNotIn("Resuming from Phase C.2", output)
+
+    def test_nothing_left_to_run(self):
+        completed = {"B", "C.0-C.1", "C.4", "C.5", "sanity"}
+        ran, output = self._resume(completed, skip_synthesis=True)
+        self.assertEqual(ran, [])
+        self.assertIn("Nothing to resume", output)
+        self.assertNotIn("Resuming from Phase", output)
+
+
+class DumpJsonLineTest(unittest.TestCase):
+    def test_stdlib_fallback_matches_orjson_output(self):
+        record = {"phase": "B", "status": "done", "note": "caf\u00e9 \u2713", "ts": 1.5}
+        expected = b'{"phase":"B","status":"done","note":"caf\xc3\xa9 \xe2\x9c\x93","ts":1.5}\n'
+        if run_pipeline.HAS_ORJSON:
+            self.assertEqual(run_pipeline.dump_json_line(record), expected)
+        with mock.patch.object(run_pipeline, "HAS_ORJSON", False):
+            self.assertEqual(run_pipeline.dump_json_line(record), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()